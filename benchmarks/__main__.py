@@ -0,0 +1,73 @@
+import argparse
+import sys
+
+from benchmarks import suite
+from benchmarks.corpus import DEFAULT_MIX, CorpusSpec
+
+
+def mix_weight(value: str) -> tuple[str, int]:
+    kind, _, weight = value.partition("=")
+    if kind not in DEFAULT_MIX or not weight.isdigit():
+        raise argparse.ArgumentTypeError(
+            f"expected KIND=WEIGHT with KIND one of {', '.join(DEFAULT_MIX)}"
+        )
+    return kind, int(weight)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python3 -m benchmarks")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument(
+        "--blocks", type=int, nargs=2, default=(10, 40), metavar=("MIN", "MAX")
+    )
+    parser.add_argument(
+        "--mix", type=mix_weight, action="append", default=[], metavar="KIND=WEIGHT"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--link-density", type=float, default=0.03)
+    parser.add_argument("--markup-density", type=float, default=0.08)
+    parser.add_argument("--nesting", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stage", action="append", dest="stages")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+    mix = {**DEFAULT_MIX, **dict(args.mix)}
+    if not 0 <= args.blocks[0] <= args.blocks[1]:
+        parser.error("--blocks needs 0 <= MIN <= MAX")
+    if not any(mix.values()):
+        parser.error("--mix leaves no block kind with a weight")
+
+    spec = CorpusSpec(
+        pages=args.pages,
+        blocks=tuple(args.blocks),
+        mix=mix,
+        link_density=args.link_density,
+        markup_density=args.markup_density,
+        nesting=args.nesting,
+        seed=args.seed,
+    )
+    results = suite.run(spec, args.repeat, args.stages)
+    suite.save(results, args.output)
+
+    baseline = None
+    if args.baseline and not args.save_baseline:
+        baseline = suite.load(args.baseline)
+        if baseline["corpus"] != results["corpus"]:
+            print("warning: baseline was recorded with a different corpus")
+    suite.report(results, baseline)
+
+    if args.save_baseline:
+        suite.save(results, args.baseline or "bench_baseline.json")
+    elif baseline is not None:
+        regressions = suite.compare(results, baseline, args.threshold)
+        if regressions:
+            sys.exit(
+                f"Regressions beyond {args.threshold:.0%}: {', '.join(regressions)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
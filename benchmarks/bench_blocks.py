@@ -0,0 +1,79 @@
+import re
+import timeit
+
+from src.blocknode import BlockNode, BlockType
+
+
+class LegacyBlockNode:
+    """Block classifier as it was before the single-pass rewrite."""
+
+    def __init__(self, markdown: str) -> None:
+        self.block = re.sub(r"^\s*", "", markdown, flags=re.MULTILINE)
+        self.block = re.sub(r"\n$", "", self.block)
+        self.block_type = self._get_block_type()
+
+    def _get_block_type(self) -> BlockType:
+        if re.match(r"#{1,6}\s", self.block):
+            return BlockType.HEADING
+        if self.block.startswith("```") and self.block.endswith("```"):
+            return BlockType.CODE
+        if all(line.startswith(">") for line in self.block.splitlines()):
+            return BlockType.QUOTE
+        if all(line.startswith("- ") for line in self.block.splitlines()):
+            return BlockType.UNORDERED_LIST
+        if all(re.match(r"^\d+\.\W", line) for line in self.block.splitlines()):
+            if self._is_ordered_list():
+                return BlockType.ORDERED_LIST
+        return BlockType.PARAGRAPH
+
+    def _is_ordered_list(self) -> bool:
+        expected_num = 1
+        for line in self.block.splitlines():
+            if not line.startswith(f"{expected_num}. "):
+                return False
+            expected_num += 1
+        return True
+
+
+def ordered_list(items: int) -> str:
+    lines = (f"    {i}. item number {i} of the list" for i in range(1, items + 1))
+    return "\n".join(lines)
+
+
+def unordered_list(items: int) -> str:
+    return "\n".join(f"    - item number {i} of the list" for i in range(items))
+
+
+def quote(lines: int) -> str:
+    return "\n".join(f"> line {i} of a long quotation" for i in range(lines))
+
+
+def paragraph(lines: int) -> str:
+    return "\n".join(f"line {i} of a paragraph" for i in range(lines))
+
+
+def bench(name: str, markdown: str, number: int, repeat: int = 5) -> None:
+    def classify(cls):
+        return lambda: cls(markdown).block_type
+
+    legacy = min(timeit.repeat(classify(LegacyBlockNode), number=number, repeat=repeat))
+    current = min(timeit.repeat(classify(BlockNode), number=number, repeat=repeat))
+    assert LegacyBlockNode(markdown).block_type == BlockNode(markdown).block_type
+    print(
+        f"{name:<28} legacy {legacy / number * 1e6:9.1f} us  "
+        f"single-pass {current / number * 1e6:9.1f} us  "
+        f"speedup {legacy / current:5.2f}x"
+    )
+
+
+def main() -> None:
+    bench("ordered list (10k items)", ordered_list(10000), 20)
+    bench("unordered list (10k items)", unordered_list(10000), 20)
+    bench("quote (10k lines)", quote(10000), 20)
+    bench("paragraph (10k lines)", paragraph(10000), 20)
+    bench("ordered list (5 items)", ordered_list(5), 20000)
+    bench("heading", "## A heading", 20000)
+
+
+if __name__ == "__main__":
+    main()
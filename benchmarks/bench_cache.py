@@ -0,0 +1,52 @@
+import random
+import timeit
+
+from benchmarks.corpus import CorpusSpec, document
+from src.cache import LRUCache
+from src.markdown_blocks import markdown_to_html
+
+SHARED_BLOCKS = [
+    "Written by **Gepsu**. Found a mistake? [Open an issue](https://github.com/Gepsu)",
+    "> This post is a work of fiction and any resemblance to _real events_ is "
+    "purely coincidental",
+    "```\nfrom src.main import main\n\nmain('/', './public')\n```",
+    "- [Home](/)\n- [Blog](/blog)\n- [Contact](/contact)\n- [About](/about)",
+]
+
+
+def documents(pages: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    spec = CorpusSpec(pages=pages, blocks=(5, 15))
+    return [
+        document(rng, spec) + "\n" + "\n\n".join(SHARED_BLOCKS) for _ in range(pages)
+    ]
+
+
+def bench(name: str, pages: list[str], repeat: int = 5) -> None:
+    def uncached():
+        for page in pages:
+            markdown_to_html(page, cache=None).to_html()
+
+    cache = LRUCache()
+
+    def cached():
+        for page in pages:
+            markdown_to_html(page, cache).to_html()
+
+    cached()  # Fill the cache with the shared blocks
+    before = min(timeit.repeat(uncached, number=1, repeat=repeat))
+    after = min(timeit.repeat(cached, number=1, repeat=repeat))
+    print(
+        f"{name:<28} uncached {before * 1000:8.1f} ms  "
+        f"cached {after * 1000:8.1f} ms  speedup {before / after:5.2f}x  "
+        f"hit rate {cache.hits / (cache.hits + cache.misses):.0%}"
+    )
+
+
+def main() -> None:
+    bench("shared blocks only", ["\n\n".join(SHARED_BLOCKS)] * 500)
+    bench("pages with shared blocks", documents(500))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import html
+import random
+import timeit
+from unittest import mock
+
+from benchmarks.corpus import CorpusSpec, document
+from src.htmlnode import LeafNode
+from src.markdown_blocks import markdown_to_html
+
+SPECIAL = ("AT&T", "a<b", "x>y", "<br>", "R&D")
+
+
+def legacy_html_parts(self: LeafNode, minify: bool = False) -> tuple[str, None, str]:
+    """Leaf rendering as it was before escaping, the baseline."""
+    if self.value == "" and self.tag != "img":
+        raise ValueError("All leaf nodes must have a value.")
+    if self.tag is None or self.tag == "":
+        return self.value, None, ""
+    return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>", None, ""
+
+
+def bolted_html_parts(self: LeafNode, minify: bool = False) -> tuple[str, None, str]:
+    """The baseline with html.escape() applied to every leaf."""
+    start, _, end = legacy_html_parts(self)
+    if self.tag is None or self.tag == "":
+        return html.escape(start, quote=False), None, end
+    value = html.escape(self.value, quote=False)
+    return f"<{self.tag}{self.props_to_html()}>{value}</{self.tag}>", None, ""
+
+
+def documents(pages: int, special: float, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    spec = CorpusSpec(pages=pages)
+    result = []
+    for _ in range(pages):
+        words = document(rng, spec).split(" ")
+        for i, word in enumerate(words):
+            if word.isalpha() and rng.random() < special:
+                words[i] = rng.choice(SPECIAL)
+        result.append(" ".join(words))
+    return result
+
+
+def bench(name: str, pages: list[str], repeat: int = 30) -> None:
+    trees = [markdown_to_html(page, cache=None) for page in pages]
+
+    def render():
+        for tree in trees:
+            tree.to_html()
+
+    # Rounds interleave the variants so load changes affect all of them alike
+    variants = {"unescaped": legacy_html_parts, "bolted": bolted_html_parts}
+    best = dict.fromkeys([*variants, "built_in"], float("inf"))
+    for _ in range(repeat):
+        for variant, html_parts in variants.items():
+            with mock.patch.object(LeafNode, "html_parts", html_parts):
+                best[variant] = min(best[variant], timeit.timeit(render, number=1))
+        best["built_in"] = min(best["built_in"], timeit.timeit(render, number=1))
+
+    unescaped, bolted, built_in = best["unescaped"], best["bolted"], best["built_in"]
+    print(
+        f"{name:<24} unescaped {unescaped * 1000:6.1f} ms  "
+        f"html.escape {bolted * 1000:6.1f} ms ({bolted / unescaped - 1:+6.1%})  "
+        f"built-in {built_in * 1000:6.1f} ms ({built_in / unescaped - 1:+6.1%})"
+    )
+
+
+def main() -> None:
+    bench("plain text", documents(200, 0))
+    bench("1% special characters", documents(200, 0.01))
+    bench("10% special characters", documents(200, 0.1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import random
+import timeit
+
+from benchmarks.corpus import WORDS, CorpusSpec, inline_text
+from src.markdown_blocks import markdown_to_blocks
+from src.markdown_inline import (
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    to_textnodes,
+)
+from src.textnode import TextNode, TextType
+
+
+def five_pass_textnodes(nodes: list[TextNode]) -> list[TextNode]:
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    return split_nodes_link(nodes)
+
+
+def paragraphs(count: int, words: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    spec = CorpusSpec(link_density=0.04, markup_density=0.06, nesting=0.0)
+    return [inline_text(rng, spec, words) for _ in range(count)]
+
+
+def bench(name: str, texts: list[str], repeat: int = 5) -> None:
+    def run_five_pass():
+        for text in texts:
+            five_pass_textnodes([TextNode(text)])
+
+    def run_single_pass():
+        for text in texts:
+            to_textnodes([TextNode(text)])
+
+    five_pass = min(timeit.repeat(run_five_pass, number=1, repeat=repeat))
+    single_pass = min(timeit.repeat(run_single_pass, number=1, repeat=repeat))
+    print(
+        f"{name:<28} five-pass {five_pass * 1000:8.2f} ms  "
+        f"single-pass {single_pass * 1000:8.2f} ms  "
+        f"speedup {five_pass / single_pass:5.2f}x"
+    )
+
+
+def main() -> None:
+    bench("short paragraphs (5k x 20)", paragraphs(5000, 20))
+    bench("long paragraphs (500 x 400)", paragraphs(500, 400))
+    bench("plain text (5k x 40)", [" ".join(WORDS * 3)] * 5000)
+    with open("content/blog/majesty/index.md") as file:
+        blocks = markdown_to_blocks(file.read())
+    bench("content/blog/majesty x 200", [block.block for block in blocks] * 200)
+
+
+if __name__ == "__main__":
+    main()
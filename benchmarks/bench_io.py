@@ -0,0 +1,80 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from unittest import mock
+
+from benchmarks.corpus import CorpusSpec, write_corpus
+from src import fileio
+from src.main import generate_pages
+from src.stats import BuildStats
+
+
+def slow(func, latency: float):
+    """Wraps a file operation with the per-file latency of a network mount."""
+
+    def wrapper(*args):
+        time.sleep(latency)
+        return func(*args)
+
+    return wrapper
+
+
+def build(tmp: str, io_threads: int, latency: float) -> tuple[float, BuildStats]:
+    stats = BuildStats()
+    with (
+        mock.patch("src.main.read_text", slow(fileio.read_text, latency)),
+        mock.patch("src.main.write_chunks", slow(fileio.write_chunks, latency)),
+        contextlib.redirect_stdout(io.StringIO()),
+    ):
+        started = time.perf_counter()
+        generate_pages(
+            os.path.join(tmp, "content"),
+            os.path.join(tmp, f"public{io_threads}"),
+            "./template.html",
+            "/",
+            stats=stats,
+            io_threads=io_threads,
+        )
+    return time.perf_counter() - started, stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.002)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(CorpusSpec(pages=args.pages), os.path.join(tmp, "content"))
+        print(f"{args.pages} pages, {args.latency * 1000:.1f} ms per file operation")
+        for threads in (0, 1, 2, 4, 8):
+            elapsed, stats = build(tmp, threads, args.latency)
+            peak = stats.counters.get("io_peak_in_flight", "-")
+            print(
+                f"io threads {threads}  {elapsed * 1000:8.1f} ms  "
+                f"peak in flight {peak}"
+            )
+        serial, threaded = (os.path.join(tmp, f"public{n}") for n in (0, 8))
+        same = all(read(serial, page) == read(threaded, page) for page in pages(serial))
+        print(f"identical output: {same}")
+
+
+def pages(root: str) -> list[str]:
+    return [
+        os.path.relpath(os.path.join(directory, name), root)
+        for directory, _, names in os.walk(root)
+        for name in names
+        if name.endswith(".html")
+    ]
+
+
+def read(root: str, page: str) -> bytes:
+    with open(os.path.join(root, page), "rb") as file:
+        return file.read()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import glob
+import tracemalloc
+
+from src.blocknode import BlockNode
+from src.htmlnode import HTMLNode, LeafNode, ParentNode
+from src.markdown_blocks import markdown_to_blocks, markdown_to_html
+from src.textnode import TextNode, TextType
+
+COPIES = 200
+
+
+class DictNode:
+    """Stand-in for a node class that keeps its attributes in __dict__."""
+
+    def __init__(self, *values) -> None:
+        for i, value in enumerate(values):
+            setattr(self, f"attribute{i}", value)
+
+
+def load_corpus() -> list[str]:
+    documents = []
+    for path in sorted(glob.glob("content/**/*.md", recursive=True)):
+        with open(path) as file:
+            documents.append(file.read())
+    return documents * COPIES
+
+
+def count_nodes(node: HTMLNode) -> int:
+    total = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        total += 1
+        if node.children is not None:
+            stack.extend(node.children)
+    return total
+
+
+def measure(factory, count: int = 100_000) -> float:
+    tracemalloc.start()
+    objects = [factory() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def bench_instances() -> None:
+    children = [LeafNode(None, "text")]
+    cases = [
+        ("LeafNode", lambda: LeafNode("b", "text"), 4),
+        ("ParentNode", lambda: ParentNode("p", children), 4),
+        ("TextNode", lambda: TextNode("text", TextType.BOLD), 3),
+        ("BlockNode", lambda: BlockNode("text"), 4),
+    ]
+    for name, factory, attributes in cases:
+        slotted = measure(factory)
+        with_dict = measure(lambda: DictNode(*[None] * attributes))
+        print(
+            f"{name:<12} __slots__ {slotted:6.1f} B/node  "
+            f"__dict__ {with_dict:6.1f} B/node  saved {1 - slotted / with_dict:4.0%}"
+        )
+
+
+def bench_corpus() -> None:
+    documents = load_corpus()
+    source_bytes = sum(len(document) for document in documents)
+
+    tracemalloc.start()
+    trees = [markdown_to_html(document, cache=None) for document in documents]
+    blocks = [markdown_to_blocks(document) for document in documents]
+    for document_blocks in blocks:
+        for block in document_blocks:
+            block.block_type
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    html_nodes = sum(count_nodes(tree) for tree in trees)
+    block_nodes = sum(len(document_blocks) for document_blocks in blocks)
+    nodes = html_nodes + block_nodes
+    print(
+        f"corpus: {len(documents)} documents, {source_bytes / 1e6:.1f} MB markdown, "
+        f"{html_nodes} html nodes, {block_nodes} block nodes"
+    )
+    print(
+        f"retained {current / 1e6:.1f} MB ({current / nodes:.1f} B/node), "
+        f"peak {peak / 1e6:.1f} MB"
+    )
+
+
+def main() -> None:
+    bench_instances()
+    bench_corpus()
+
+
+if __name__ == "__main__":
+    main()
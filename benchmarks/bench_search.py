@@ -0,0 +1,119 @@
+import argparse
+import contextlib
+import gzip
+import io
+import itertools
+import os
+import random
+import string
+import tempfile
+import time
+
+from benchmarks.corpus import CorpusSpec, generate_documents
+from src.cache import block_cache
+from src.main import generate_pages
+from src.search import DOCS_NAME, SEARCH_DIRECTORY
+from src.stats import BuildStats
+
+
+def vocabulary(size: int, rng: random.Random) -> list[str]:
+    """Random words, so the index has a realistic number of distinct terms."""
+    letters = string.ascii_lowercase
+    return [
+        "".join(rng.choices(letters, k=rng.randint(3, 10))) for _ in range(size)
+    ]
+
+
+def write_pages(directory: str, pages: int, size: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    terms = vocabulary(size, rng)
+    # Word frequencies follow Zipf's law, like natural language
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, size + 1)))
+    paths = []
+    for i, contents in enumerate(generate_documents(CorpusSpec(pages=pages))):
+        words = contents.split(" ")
+        picks = iter(rng.choices(terms, cum_weights=weights, k=len(words)))
+        words = [next(picks) if word.isalpha() else word for word in words]
+        path = os.path.join(directory, f"section{i % 10}", f"page{i}", "index.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(" ".join(words))
+        paths.append(path)
+    return paths
+
+
+def build(tmp: str, output: str, search: bool) -> tuple[float, BuildStats]:
+    stats = BuildStats()
+    # Every build starts cold, so the first one does not warm up the next
+    block_cache.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        generate_pages(
+            os.path.join(tmp, "content"),
+            os.path.join(tmp, output),
+            "./template.html",
+            "/",
+            incremental=True,
+            stats=stats,
+            search=search,
+        )
+    return time.perf_counter() - started, stats
+
+
+def report_index(directory: str) -> None:
+    sizes = []
+    compressed = 0
+    for entry in os.scandir(directory):
+        with open(entry.path, "rb") as file:
+            compressed += len(gzip.compress(file.read()))
+        if entry.name != DOCS_NAME:
+            sizes.append(entry.stat().st_size)
+    docs = os.path.getsize(os.path.join(directory, DOCS_NAME))
+    total = sum(sizes) + docs
+    print(
+        f"index {total / 1e6:.2f} MB ({compressed / 1e6:.2f} MB gzipped), "
+        f"docs.json {docs / 1e3:.0f} kB, {len(sizes)} shards: "
+        f"mean {sum(sizes) / len(sizes) / 1e3:.1f} kB, "
+        f"largest {max(sizes) / 1e3:.1f} kB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10000)
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--changed", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_pages(os.path.join(tmp, "content"), args.pages, args.vocabulary)
+        print(f"{args.pages} pages, {args.vocabulary} word vocabulary")
+        plain, _ = build(tmp, "plain", False)
+        indexed, stats = build(tmp, "indexed", True)
+        tokenize = stats.stages["tokenize"]["wall"]
+        update = stats.stages["search"]["wall"]
+        print(
+            f"full build     {plain:7.2f} s without search, {indexed:7.2f} s with "
+            f"(tokenize {tokenize:.2f} s, index {update:.2f} s)"
+        )
+        report_index(os.path.join(tmp, "indexed", SEARCH_DIRECTORY))
+
+        elapsed, stats = build(tmp, "indexed", True)
+        print(
+            f"unchanged      {elapsed:7.2f} s "
+            f"(index {stats.stages['search']['wall']:.2f} s)"
+        )
+        for path in random.Random(1).sample(paths, args.changed):
+            with open(path, "a") as file:
+                file.write("\n\nAn appended paragraph about palantiri.\n")
+        elapsed, stats = build(tmp, "indexed", True)
+        written = stats.counters["search_files_written"]
+        print(
+            f"{args.changed} changed pages  {elapsed:7.2f} s "
+            f"(index {stats.stages['search']['wall']:.2f} s, "
+            f"{written} files rewritten)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import tempfile
+import timeit
+
+from src.walk import iter_files
+
+
+def legacy_get_contents_r(dir: str, root: str = "") -> list[str]:
+    """Content discovery as it was before the scandir walker."""
+    if not root:
+        root = dir
+
+    paths = []
+
+    for item in os.listdir(dir):
+        item_path = os.path.join(dir, item)
+        if os.path.isfile(item_path):
+            paths.append(os.path.relpath(item_path, root))
+        elif os.path.isdir(item_path):
+            paths.extend(legacy_get_contents_r(item_path, root))
+
+    return paths
+
+
+def make_tree(root: str, files: int, per_directory: int = 50) -> None:
+    for i in range(files):
+        group = i // per_directory
+        directory = os.path.join(root, f"section{group % 20}", f"dir{group}")
+        if i % per_directory == 0:
+            os.makedirs(directory, exist_ok=True)
+        open(os.path.join(directory, f"page{i}.md"), "w").close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python3 -m benchmarks.bench_walk")
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root, args.files)
+        assert sorted(legacy_get_contents_r(root)) == list(iter_files(root, ()))
+
+        def first_file():
+            return next(iter_files(root))
+
+        timings = {
+            "legacy get_contents_r (sorted)": lambda: sorted(
+                legacy_get_contents_r(root)
+            ),
+            "iter_files": lambda: list(iter_files(root)),
+        }
+        for name, func in timings.items():
+            best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+            print(f"{name:<32} {best * 1000:9.1f} ms")
+        best = min(timeit.repeat(first_file, number=1, repeat=args.repeat))
+        print(f"{'iter_files first path':<32} {best * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
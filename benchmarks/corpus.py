@@ -0,0 +1,123 @@
+import os
+import random
+
+WORDS = (
+    "the ring of power was forged in the fires of mount doom by sauron while elves "
+    "and dwarves and men of the west gathered at rivendell to decide its fate"
+).split()
+
+DEFAULT_MIX = {
+    "paragraph": 6,
+    "heading": 2,
+    "unordered_list": 1,
+    "ordered_list": 1,
+    "quote": 1,
+    "code": 1,
+}
+
+
+class CorpusSpec:
+    def __init__(
+        self,
+        pages: int = 200,
+        blocks: tuple[int, int] = (10, 40),
+        mix: dict[str, int] | None = None,
+        link_density: float = 0.03,
+        markup_density: float = 0.08,
+        nesting: float = 0.2,
+        seed: int = 0,
+    ) -> None:
+        self.pages = pages
+        self.blocks = blocks
+        self.mix = mix if mix is not None else DEFAULT_MIX
+        self.link_density = link_density
+        self.markup_density = markup_density
+        self.nesting = nesting
+        self.seed = seed
+
+    def to_dict(self) -> dict:
+        return {
+            "pages": self.pages,
+            "blocks": list(self.blocks),
+            "mix": self.mix,
+            "link_density": self.link_density,
+            "markup_density": self.markup_density,
+            "nesting": self.nesting,
+            "seed": self.seed,
+        }
+
+
+def words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choices(WORDS, k=count))
+
+
+def inline_text(rng: random.Random, spec: CorpusSpec, count: int) -> str:
+    parts = []
+    for _ in range(count):
+        roll = rng.random()
+        word = rng.choice(WORDS)
+        if roll < spec.link_density:
+            parts.append(f"[{word}](/{rng.choice(WORDS)}/{rng.choice(WORDS)})")
+        elif roll < spec.link_density * 1.2:
+            parts.append(f"![{word}](/images/{rng.choice(WORDS)}.png)")
+        elif roll < spec.link_density * 1.2 + spec.markup_density:
+            parts.append(markup(rng, spec, word))
+        else:
+            parts.append(word)
+    return " ".join(parts)
+
+
+def markup(rng: random.Random, spec: CorpusSpec, word: str) -> str:
+    if rng.random() < spec.nesting:
+        # Bold spans keep other delimiters literal, italic spans keep backticks
+        inner = f"{word} _{rng.choice(WORDS)}_ `{rng.choice(WORDS)}`"
+        return rng.choice([f"**{inner}**", f"_{word} `{rng.choice(WORDS)}`_"])
+    return rng.choice([f"**{word}**", f"_{word}_", f"`{word}`"])
+
+
+def block(rng: random.Random, spec: CorpusSpec, kind: str) -> str:
+    match kind:
+        case "heading":
+            return f"{'#' * rng.randint(2, 4)} {words(rng, rng.randint(2, 6))}"
+        case "unordered_list":
+            items = rng.randint(2, 8)
+            return "\n".join(f"- {inline_text(rng, spec, 8)}" for _ in range(items))
+        case "ordered_list":
+            items = rng.randint(2, 8)
+            return "\n".join(
+                f"{i}. {inline_text(rng, spec, 8)}" for i in range(1, items + 1)
+            )
+        case "quote":
+            lines = rng.randint(1, 4)
+            return "\n".join(f"> {inline_text(rng, spec, 12)}" for _ in range(lines))
+        case "code":
+            lines = (f"    {words(rng, 5)}" for _ in range(rng.randint(2, 10)))
+            return "```\n" + "\n".join(lines) + "\n```"
+        case _:
+            lines = rng.randint(1, 5)
+            return "\n".join(inline_text(rng, spec, 14) for _ in range(lines))
+
+
+def document(rng: random.Random, spec: CorpusSpec) -> str:
+    kinds = rng.choices(
+        list(spec.mix), weights=list(spec.mix.values()), k=rng.randint(*spec.blocks)
+    )
+    blocks = [f"# {words(rng, rng.randint(2, 6)).title()}"]
+    blocks.extend(block(rng, spec, kind) for kind in kinds)
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate_documents(spec: CorpusSpec) -> list[str]:
+    rng = random.Random(spec.seed)
+    return [document(rng, spec) for _ in range(spec.pages)]
+
+
+def write_corpus(spec: CorpusSpec, directory: str) -> list[str]:
+    paths = []
+    for i, contents in enumerate(generate_documents(spec)):
+        path = os.path.join(directory, f"section{i % 10}", f"page{i}", "index.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(contents)
+        paths.append(path)
+    return paths
@@ -0,0 +1,126 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import tempfile
+import timeit
+from collections.abc import Callable
+
+from benchmarks.corpus import CorpusSpec, generate_documents, write_corpus
+from src import main as build
+from src.cache import block_cache
+from src.markdown_blocks import markdown_to_blocks, markdown_to_html
+from src.markdown_inline import to_textnodes
+from src.textnode import TextNode
+
+
+def time_stage(func: Callable[[], object], repeat: int) -> dict[str, float]:
+    func()  # Warm up lazily computed state and caches
+    timings = timeit.repeat(func, number=1, repeat=repeat)
+    return {"best": min(timings), "mean": sum(timings) / len(timings)}
+
+
+def stage_benchmarks(spec: CorpusSpec) -> dict[str, Callable[[], object]]:
+    documents = generate_documents(spec)
+    blocks = [block for document in documents for block in markdown_to_blocks(document)]
+    texts = [block.block for block in blocks if not block.block.startswith("```")]
+    trees = [markdown_to_html(document, cache=None) for document in documents]
+
+    def parse_blocks():
+        for document in documents:
+            markdown_to_blocks(document)
+
+    def blocks_to_html_nodes():
+        for block in blocks:
+            block.to_html_node()
+
+    def inline_textnodes():
+        for text in texts:
+            to_textnodes([TextNode(text)])
+
+    def serialize_html():
+        for tree in trees:
+            tree.to_html()
+
+    return {
+        "markdown_to_blocks": parse_blocks,
+        "BlockNode.to_html_node": blocks_to_html_nodes,
+        "to_textnodes": inline_textnodes,
+        "ParentNode.to_html": serialize_html,
+    }
+
+
+@contextlib.contextmanager
+def site_directory(spec: CorpusSpec):
+    root = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(spec, os.path.join(tmp, "content"))
+        shutil.copytree(os.path.join(root, "static"), os.path.join(tmp, "static"))
+        shutil.copy(os.path.join(root, "template.html"), tmp)
+        os.chdir(tmp)
+        try:
+            yield tmp
+        finally:
+            os.chdir(root)
+
+
+def build_benchmark(spec: CorpusSpec, repeat: int) -> dict[str, float]:
+    with site_directory(spec) as tmp:
+        output = os.path.join(tmp, "public")
+
+        def full_build():
+            # Every repeat starts cold, so the result does not depend on
+            # whether the corpus fits in the cache left by the previous one
+            block_cache.clear()
+            with contextlib.redirect_stdout(io.StringIO()):
+                build.main("/", output)
+
+        return time_stage(full_build, repeat)
+
+
+def run(spec: CorpusSpec, repeat: int = 5, stages: list[str] | None = None) -> dict:
+    results = {}
+    for name, func in stage_benchmarks(spec).items():
+        if stages is None or name in stages:
+            results[name] = time_stage(func, repeat)
+    if stages is None or "main" in stages:
+        results["main"] = build_benchmark(spec, repeat)
+    return {
+        "python": platform.python_version(),
+        "corpus": spec.to_dict(),
+        "results": results,
+    }
+
+
+def save(results: dict, path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+def load(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for name, timing in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        if timing["best"] > previous["best"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def report(current: dict, baseline: dict | None = None) -> None:
+    for name, timing in current["results"].items():
+        line = f"{name:<24} best {timing['best'] * 1000:9.2f} ms"
+        line += f"  mean {timing['mean'] * 1000:9.2f} ms"
+        previous = baseline["results"].get(name) if baseline else None
+        if previous is not None:
+            line += f"  baseline {previous['best'] * 1000:9.2f} ms"
+            line += f"  {timing['best'] / previous['best'] - 1:+7.1%}"
+        print(line)
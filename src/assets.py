@@ -0,0 +1,71 @@
+import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LINK_MODES = ("copy", "hardlink", "reflink")
+FICLONE = 0x40049409
+FINGERPRINT_LENGTH = 8
+
+
+def is_current(src: os.stat_result, dest: str, compare_mtime: bool = True) -> bool:
+    try:
+        stat = os.stat(dest)
+    except FileNotFoundError:
+        return False
+    if stat.st_size != src.st_size:
+        return False
+    return not compare_mtime or stat.st_mtime_ns == src.st_mtime_ns
+
+
+def fingerprinted_name(item: str, digest: str) -> str:
+    root, extension = os.path.splitext(item)
+    return f"{root}.{digest[:FINGERPRINT_LENGTH]}{extension}"
+
+
+def is_same_file(path: str, other: str) -> bool:
+    try:
+        return os.path.samefile(path, other)
+    except OSError:
+        return False
+
+
+def install_file(src: str, dest: str, link: str = "copy") -> None:
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp_dest = f"{dest}.tmp"
+    try:
+        if link == "hardlink":
+            _hardlink(src, tmp_dest)
+        elif link == "reflink":
+            _reflink(src, tmp_dest)
+        else:
+            shutil.copy2(src, tmp_dest)
+    except BaseException:
+        if os.path.exists(tmp_dest):
+            os.remove(tmp_dest)
+        raise
+    os.replace(tmp_dest, dest)
+
+
+def _hardlink(src: str, dest: str) -> None:
+    if os.path.exists(dest):
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        # Different filesystems or no hardlink support, so fall back to a copy
+        shutil.copy2(src, dest)
+
+
+def _reflink(src: str, dest: str) -> None:
+    try:
+        if fcntl is None:
+            raise OSError("reflinks are not supported on this platform")
+        with open(src, "rb") as source, open(dest, "wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        shutil.copystat(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
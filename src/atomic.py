@@ -0,0 +1,72 @@
+import os
+import shutil
+import time
+
+GENERATION_PREFIX = "build-"
+
+
+def generations_directory(output: str) -> str:
+    return f"{os.path.normpath(output)}.builds"
+
+
+def live_directory(output: str) -> str | None:
+    if os.path.islink(output):
+        return os.path.realpath(output)
+    if os.path.isdir(output):
+        return output
+    return None
+
+
+def stage_output(output: str) -> str:
+    root = generations_directory(output)
+    os.makedirs(root, exist_ok=True)
+    staging = os.path.join(root, f"{GENERATION_PREFIX}{time.time_ns()}")
+    live = live_directory(output)
+    if live is None:
+        os.mkdir(staging)
+    else:
+        # Hardlinks are safe to share because every build step replaces files
+        # through a temporary file instead of writing into them
+        shutil.copytree(live, staging, symlinks=True, copy_function=_link_or_copy)
+    return staging
+
+
+def swap_output(output: str, staging: str, keep: int = 2) -> None:
+    output = os.path.normpath(output)
+    if os.path.isdir(output) and not os.path.islink(output):
+        # A plain directory cannot be replaced atomically, so it is moved into
+        # the generations directory once and served through a symlink after
+        legacy = os.path.join(generations_directory(output), f"{GENERATION_PREFIX}0")
+        discard_output(legacy)
+        os.rename(output, legacy)
+    link = f"{output}.tmp"
+    if os.path.lexists(link):
+        os.remove(link)
+    target = os.path.relpath(staging, os.path.dirname(os.path.abspath(output)))
+    os.symlink(target, link)
+    os.replace(link, output)
+    prune_generations(output, keep)
+
+
+def discard_output(staging: str) -> None:
+    shutil.rmtree(staging, ignore_errors=True)
+
+
+def prune_generations(output: str, keep: int = 2) -> None:
+    root = generations_directory(output)
+    live = live_directory(output)
+    generations = sorted(
+        (entry for entry in os.listdir(root) if entry.startswith(GENERATION_PREFIX)),
+        key=lambda entry: int(entry.removeprefix(GENERATION_PREFIX)),
+    )
+    for entry in generations[:-keep] if keep else generations:
+        path = os.path.join(root, entry)
+        if live is None or not os.path.samefile(path, live):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _link_or_copy(src: str, dest: str) -> None:
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
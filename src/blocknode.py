@@ -1,79 +1,167 @@
 import re
 from enum import StrEnum
+from itertools import count, repeat
 
 from src.htmlnode import HTMLNode, LeafNode, ParentNode
 from src.markdown_inline import to_textnodes
 from src.textnode import TextNode, TextType
+from src.urls import UrlResolver
 
 BlockType = StrEnum(
     "BlockType",
     ["PARAGRAPH", "HEADING", "CODE", "QUOTE", "UNORDERED_LIST", "ORDERED_LIST"],
 )
 
+HEADING_PATTERN = re.compile(r"#{1,6}\s")
+# Line boundaries str.splitlines() honours besides "\n"
+LINE_BREAK_PATTERN = re.compile("[\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+class Heading:
+    __slots__ = ("level", "text")
+
+    def __init__(self, level: int, text: str) -> None:
+        self.level = level
+        self.text = text
+
+    def __eq__(self, value: object, /) -> bool:
+        return (
+            isinstance(value, Heading)
+            and self.level == value.level
+            and self.text == value.text
+        )
+
+    def __repr__(self) -> str:
+        return f"Heading({self.level}, {self.text!r})"
+
 
 class BlockNode:
+    __slots__ = ("markdown", "_lines", "_block", "_block_type")
+
     def __init__(self, markdown: str) -> None:
-        self.block = re.sub(r"^\s*", "", markdown, flags=re.MULTILINE)
-        self.block = re.sub(r"\n$", "", self.block)
-        self.block_type = self._get_block_type()
+        self.markdown = markdown
+        self._lines: list[str] | None = None
+        self._block: str | None = None
+        self._block_type: BlockType | None = None
+
+    @property
+    def lines(self) -> list[str]:
+        if self._lines is None:
+            self._normalize()
+        return self._lines
+
+    @property
+    def block(self) -> str:
+        if self._block is None:
+            self._normalize()
+        return self._block
+
+    @property
+    def block_type(self) -> BlockType:
+        if self._block_type is None:
+            self._block_type = self._get_block_type()
+        return self._block_type
+
+    @property
+    def heading(self) -> Heading | None:
+        # Checking the raw markdown first lets most blocks skip normalizing
+        if not self.markdown.lstrip().startswith("#"):
+            return None
+        if self.block_type != BlockType.HEADING:
+            return None
+        marker, _, text = self.block.partition(" ")
+        return Heading(len(marker), text)
 
-    def to_html_node(self) -> HTMLNode:
+    def to_html_node(
+        self, resolver: UrlResolver | None = None, text: list[str] | None = None
+    ) -> HTMLNode:
+        # When given, text collects the text nodes of the block for searching
         match self.block_type:
             case BlockType.HEADING:
-                splits = self.block.split(" ")
-                num = len(splits[0])
-                value = " ".join(splits[1:])
-                return ParentNode(f"h{num}", BlockNode._text_to_children(value))
+                heading = self.heading
+                children = BlockNode._text_to_children(heading.text, resolver, text)
+                return ParentNode(f"h{heading.level}", children)
             case BlockType.CODE:
                 value = self.block.replace("```", "").lstrip("\n")
                 return ParentNode("pre", [LeafNode("code", value)])
             case BlockType.QUOTE:
-                block = re.sub(r">\s*", "", self.block, re.MULTILINE)
-                values = BlockNode._text_to_children(block)
-                return ParentNode("blockquote", values)
+                lines = (line[1:].lstrip() for line in self.lines)
+                block = "\n".join(line for line in lines if line)
+                children = BlockNode._text_to_children(block, resolver, text)
+                return ParentNode("blockquote", children)
             case BlockType.UNORDERED_LIST | BlockType.ORDERED_LIST:
-                block = (
-                    re.sub(r"-\s", "", self.block)
-                    if self.block_type == BlockType.UNORDERED_LIST
-                    else re.sub(r"\d*\. ", "", self.block)
-                )
+                is_unordered = self.block_type == BlockType.UNORDERED_LIST
+                marker = "- " if is_unordered else ". "
+                items = (line.partition(marker)[2] for line in self.lines)
                 values = [
-                    ParentNode("li", BlockNode._text_to_children(line))
-                    for line in block.splitlines()
+                    ParentNode("li", BlockNode._text_to_children(item, resolver, text))
+                    for item in items
                 ]
-                return ParentNode(
-                    "ul" if self.block_type == BlockType.UNORDERED_LIST else "ol",
-                    values,
-                )
+                return ParentNode("ul" if is_unordered else "ol", values)
             case BlockType.PARAGRAPH:
-                values = BlockNode._text_to_children(self.block.replace("\n", " "))
+                block = " ".join(self.lines)
+                values = BlockNode._text_to_children(block, resolver, text)
                 return ParentNode("p", values)
 
     @staticmethod
-    def _text_to_children(block) -> list[LeafNode]:
-        return [node.to_html_node() for node in to_textnodes([TextNode(block)])]
+    def _text_to_children(
+        block: str,
+        resolver: UrlResolver | None = None,
+        text: list[str] | None = None,
+    ) -> list[LeafNode]:
+        nodes = to_textnodes([TextNode(block)])
+        if text is not None:
+            text.extend(node.text for node in nodes)
+        return [node.to_html_node(resolver) for node in nodes]
+
+    def _normalize(self) -> None:
+        if self._is_fence():
+            self._normalize_fence()
+            return
+        lines = list(filter(None, map(str.lstrip, self.markdown.split("\n"))))
+        self._block = "\n".join(lines)
+        if LINE_BREAK_PATTERN.search(self._block):
+            lines = self._block.splitlines()
+        self._lines = lines
+
+    def _is_fence(self) -> bool:
+        markdown = self.markdown.strip()
+        return markdown.startswith("```") and markdown.endswith("```")
+
+    def _normalize_fence(self) -> None:
+        # The body of a fence is kept verbatim, only the indentation of the
+        # opening fence is taken off its lines
+        lines = self.markdown.split("\n")
+        start = next(i for i, line in enumerate(lines) if line.strip())
+        end = max(i for i, line in enumerate(lines) if line.strip()) + 1
+        lines = lines[start:end]
+        indent = len(lines[0]) - len(lines[0].lstrip(" "))
+        lines = [
+            line[min(indent, len(line) - len(line.lstrip(" "))) :] for line in lines
+        ]
+        self._block = "\n".join(lines)
+        self._lines = lines
 
     def _get_block_type(self) -> BlockType:
-        if re.match(r"#{1,6}\s", self.block):
+        if HEADING_PATTERN.match(self.block):
             return BlockType.HEADING
         if self.block.startswith("```") and self.block.endswith("```"):
             return BlockType.CODE
-        if all(line.startswith(">") for line in self.block.splitlines()):
-            return BlockType.QUOTE
-        if all(line.startswith("- ") for line in self.block.splitlines()):
-            return BlockType.UNORDERED_LIST
-        if all(re.match(r"^\d+\.\W", line) for line in self.block.splitlines()):
-            if self._is_ordered_list():
-                return BlockType.ORDERED_LIST
-        return BlockType.PARAGRAPH
 
-    def _is_ordered_list(self) -> bool:
-        expected_num = 1
-        for line in self.block.splitlines():
-            if not line.startswith(f"{expected_num}. "):
-                return False
-            expected_num += 1
-        return True
+        # A list or quote is decided by its first line, so only that candidate's
+        # line prefixes need checking.
+        first = self.lines[0] if self.lines else ">"
+        if first.startswith(">"):
+            block_type, prefixes = BlockType.QUOTE, repeat(">")
+        elif first.startswith("- "):
+            block_type, prefixes = BlockType.UNORDERED_LIST, repeat("- ")
+        elif first.startswith("1. "):
+            block_type, prefixes = BlockType.ORDERED_LIST, map("{}. ".format, count(1))
+        else:
+            return BlockType.PARAGRAPH
+        if all(map(str.startswith, self.lines, prefixes)):
+            return block_type
+        return BlockType.PARAGRAPH
 
     def __eq__(self, value: object, /) -> bool:
         return (
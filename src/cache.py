@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+DEFAULT_BLOCK_CACHE_SIZE = 4096
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = DEFAULT_BLOCK_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, object] = OrderedDict()
+
+    def get(self, key: str) -> object | None:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: object) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        while len(self._entries) > max(maxsize, 0):
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"LRUCache(maxsize={self.maxsize}, size={len(self)}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+
+block_cache = LRUCache()
+
+
+def set_block_cache_size(maxsize: int) -> None:
+    block_cache.resize(maxsize)
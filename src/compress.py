@@ -0,0 +1,34 @@
+import gzip
+import os
+
+from src.manifest import hash_file
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".css")
+DEFAULT_GZIP_THRESHOLD = 1024
+GZIP_SUFFIX = ".gz"
+
+
+def is_compressible(path: str, size: int, threshold: int) -> bool:
+    return path.endswith(COMPRESSIBLE_EXTENSIONS) and size >= threshold
+
+
+def gzip_file(path: str, level: int = 9) -> tuple[int, int]:
+    with open(path, "rb") as file:
+        data = file.read()
+    # A fixed mtime keeps the sidecar byte-identical when the file is unchanged
+    compressed = gzip.compress(data, compresslevel=level, mtime=0)
+    tmp_path = f"{path}{GZIP_SUFFIX}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(compressed)
+    os.replace(tmp_path, f"{path}{GZIP_SUFFIX}")
+    return len(data), len(compressed)
+
+
+def gzip_if_changed(
+    path: str, previous: str | None
+) -> tuple[str, tuple[int, int] | None]:
+    # Runs in a thread, hashing and zlib both release the GIL on large inputs
+    digest = hash_file(path)
+    if digest == previous and os.path.exists(f"{path}{GZIP_SUFFIX}"):
+        return digest, None
+    return digest, gzip_file(path)
@@ -0,0 +1,88 @@
+import os
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DEFAULT_IO_THREADS = 4
+
+
+def read_text(path: str) -> str:
+    with open(path) as file:
+        return file.read()
+
+
+def write_chunks(dest: str, chunks: Iterable[str]) -> None:
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp_dest = f"{dest}.tmp"
+    # Opened outside the try, so a failed open reports its own error rather
+    # than the missing temporary file
+    file = open(tmp_dest, "w")
+    try:
+        with file:
+            file.writelines(chunks)
+    except BaseException:
+        os.remove(tmp_dest)
+        raise
+    os.replace(tmp_dest, dest)
+
+
+class IOPool:
+    def __init__(self, threads: int = DEFAULT_IO_THREADS) -> None:
+        self.threads = threads
+        # Reads run at most this far ahead and writes at most this far behind
+        self.limit = 2 * threads
+        self.peak = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.limit)
+        self._executor = ThreadPoolExecutor(threads, thread_name_prefix="io")
+        self._reads: dict[str, Future] = {}
+        self._writes: list[tuple[str, Future]] = []
+        self._closed = False
+
+    def prefetch(self, path: str, func: Callable, *args) -> None:
+        self._reads[path] = self._submit(func, *args)
+
+    def take(self, path: str):
+        return self._reads.pop(path).result()
+
+    def write(self, path: str, func: Callable, *args) -> None:
+        self._writes.append((path, self._submit(func, *args)))
+
+    def close(self) -> list[tuple[str, BaseException]]:
+        if not self._closed:
+            self._closed = True
+            self._executor.shutdown(wait=True)
+        return [
+            (path, future.exception())
+            for path, future in self._writes
+            if future.exception() is not None
+        ]
+
+    def _submit(self, func: Callable, *args) -> Future:
+        # Blocks the caller while too many operations are queued, so buffered
+        # reads and unwritten pages stay bounded on a slow filesystem
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._run, func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _run(self, func: Callable, *args):
+        with self._lock:
+            self._active += 1
+            self.peak = max(self.peak, self._active)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def __enter__(self) -> "IOPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
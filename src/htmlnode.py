@@ -1,55 +1,134 @@
+from collections.abc import Iterable, Iterator, Sized
+from typing import TextIO
+
+VOID_ELEMENTS = frozenset(
+    "area base br col embed hr img input link meta source track wbr".split()
+)
+
+
+def escape(text: str) -> str:
+    # Most text has nothing to escape and is returned after three quick scans.
+    # Chained replace() beats str.translate(), which falls back to a slow
+    # per-character loop when a character maps to several
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(value: str) -> str:
+    return escape(value).replace('"', "&quot;")
+
+
+def props_to_html(props: dict | None) -> str:
+    if not props:
+        return ""
+    return "".join(f' {k}="{escape_attribute(str(v))}"' for k, v in props.items())
+
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "_props", "_props_html")
+
     def __init__(
         self,
         tag: str | None = None,
         value: str | None = None,
-        children: list | None = None,
+        children: Iterable | None = None,
         props: dict | None = None,
     ) -> None:
         self.tag = tag
         self.value = value
         self.children = children
-        self.props = props
+        self._props = props
+        self._props_html = props_to_html(props)
+
+    def to_html(self, minify: bool = False) -> str:
+        return "".join(self.iter_html(minify))
 
-    def to_html(self):
+    def write_to(self, file: TextIO, minify: bool = False) -> None:
+        file.writelines(self.iter_html(minify))
+
+    def iter_html(self, minify: bool = False) -> Iterator[str]:
+        stack: list[tuple[Iterator, str]] = [(iter((self,)), "")]
+        while stack:
+            children, end_tag = stack[-1]
+            node = next(children, None)
+            if node is None:
+                stack.pop()
+                if end_tag:
+                    yield end_tag
+                continue
+            start, node_children, node_end_tag = node.html_parts(minify)
+            yield start
+            if node_children is not None:
+                stack.append((iter(node_children), node_end_tag))
+
+    def html_parts(self, minify: bool = False) -> tuple[str, Iterable | None, str]:
         raise NotImplementedError()
 
-    def props_to_html(self):
-        if self.props is None:
-            return ""
-        return f" {' '.join([f'{k}="{v}"' for k, v in self.props.items()])}"
+    @property
+    def props(self) -> dict | None:
+        return self._props
+
+    @props.setter
+    def props(self, props: dict | None) -> None:
+        # Attributes are escaped once here rather than on every render
+        self._props = props
+        self._props_html = props_to_html(props)
+
+    def props_to_html(self) -> str:
+        return self._props_html
 
     def __repr__(self) -> str:
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props}"
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag: str | None, value: str, props: dict | None = None) -> None:
         super().__init__(tag, value, None, props)
 
-    def to_html(self):
+    def html_parts(self, minify: bool = False) -> tuple[str, None, str]:
         if self.value == "" and self.tag != "img":
             raise ValueError("All leaf nodes must have a value.")
+        value = self.value
+        # The check is repeated here to skip a call for the common safe leaf
+        if "&" in value or "<" in value or ">" in value:
+            value = escape(value)
         if self.tag is None or self.tag == "":
-            return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            return value, None, ""
+        if minify and self.tag in VOID_ELEMENTS:
+            # Void elements cannot have content, so the end tag is dropped
+            return f"<{self.tag}{self._props_html}>", None, ""
+        return f"<{self.tag}{self._props_html}>{value}</{self.tag}>", None, ""
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(
         self,
         tag: str,
-        children: list,
+        children: Iterable,
         props: dict | None = None,
     ) -> None:
         super().__init__(tag, None, children, props)
 
-    def to_html(self):
+    def html_parts(self, minify: bool = False) -> tuple[str, Iterable, str]:
         if self.tag == "":
             raise ValueError("All parent nodes must have a value.")
-        if self.children is None or len(self.children) == 0:
+        if self.children is None or (
+            isinstance(self.children, Sized) and len(self.children) == 0
+        ):
             raise ValueError("All parent nodes must have children.")
-        inner_html = ""
-        for child in self.children:
-            inner_html += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{inner_html}</{self.tag}>"
+        return f"<{self.tag}{self._props_html}>", self.children, f"</{self.tag}>"
+
+
+class RawNode(HTMLNode):
+    __slots__ = ()
+
+    def __init__(self, value: str) -> None:
+        super().__init__(None, value, None, None)
+
+    def html_parts(self, minify: bool = False) -> tuple[str, None, str]:
+        return self.value, None, ""
@@ -0,0 +1,50 @@
+import mmap
+import struct
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+GIF_SIGNATURES = (b"GIF87a", b"GIF89a")
+JPEG_SIGNATURE = b"\xff\xd8"
+HEADER_SIZE = 24
+# Start of frame markers hold the dimensions, C4, C8 and CC share the range
+JPEG_FRAME_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_STANDALONE_MARKERS = frozenset((0x01, *range(0xD0, 0xD8)))
+
+
+def is_image(path: str) -> bool:
+    return path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def image_size(path: str) -> tuple[int, int] | None:
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+        if header.startswith(PNG_SIGNATURE) and len(header) == HEADER_SIZE:
+            if header[12:16] == b"IHDR":
+                return struct.unpack(">II", header[16:24])
+        elif header[:6] in GIF_SIGNATURES and len(header) >= 10:
+            return struct.unpack("<HH", header[6:10])
+        elif header.startswith(JPEG_SIGNATURE):
+            # Metadata segments come before the frame header and can be large,
+            # so the file is mapped and only the segment headers are touched
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return _jpeg_size(data)
+    return None
+
+
+def _jpeg_size(data: mmap.mmap) -> tuple[int, int] | None:
+    position = len(JPEG_SIGNATURE)
+    while position + 9 <= len(data):
+        if data[position] != 0xFF:
+            return None
+        marker = data[position + 1]
+        if marker == 0xFF:
+            position += 1
+        elif marker in JPEG_STANDALONE_MARKERS:
+            position += 2
+        elif marker in JPEG_FRAME_MARKERS:
+            height, width = struct.unpack_from(">HH", data, position + 5)
+            return width, height
+        else:
+            (length,) = struct.unpack_from(">H", data, position + 2)
+            position += 2 + length
+    return None
@@ -1,92 +1,969 @@
 import argparse
+import itertools
 import os
-import re
 import shutil
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-from src.markdown_blocks import markdown_to_html
+from src.assets import (
+    LINK_MODES,
+    fingerprinted_name,
+    install_file,
+    is_current,
+    is_same_file,
+)
+from src.atomic import discard_output, stage_output, swap_output
+from src.cache import DEFAULT_BLOCK_CACHE_SIZE, block_cache, set_block_cache_size
+from src.compress import (
+    DEFAULT_GZIP_THRESHOLD,
+    GZIP_SUFFIX,
+    gzip_if_changed,
+    is_compressible,
+)
+from src.fileio import DEFAULT_IO_THREADS, IOPool, read_text, write_chunks
+from src.htmlnode import escape
+from src.images import image_size, is_image
+from src.manifest import MANIFEST_NAME, Manifest, hash_bytes, hash_file
+from src.markdown_blocks import extract_title, parse_markdown
+from src.parse_cache import ParseCache
+from src.search import (
+    SEARCH_DIRECTORY,
+    TEXT_CONTEXT,
+    SearchEntry,
+    SearchIndex,
+    remove_index,
+    tokenize,
+)
+from src.serve import LiveReload, Watcher, start_server
+from src.stats import BuildStats, ByteCounter, NullStats
+from src.template import Template, load_template
+from src.urls import UrlResolver
+from src.walk import DEFAULT_IGNORE, iter_files
 
 
-def main(basepath: str, output: str) -> None:
-    clean_output_directory(output)
-    copy_contents("./static", output)
-    generate_pages("./content", output, "./template.html", basepath)
+class BuildError(Exception):
+    def __init__(self, errors: list[tuple[str, Exception]]) -> None:
+        self.errors = errors
+        details = "\n".join(f"  {page}: {error}" for page, error in errors)
+        super().__init__(f"Failed to generate {len(errors)} page(s):\n{details}")
+
+
+NULL_STATS = NullStats()
+TASK_CHUNKSIZE = 8
+PARSE_CACHE_DIRECTORY = "./.cache/parse"
+
+
+def main(
+    basepath: str,
+    output: str,
+    incremental: bool = False,
+    jobs: int = 1,
+    stats: BuildStats = NULL_STATS,
+    *,
+    checksum: bool = False,
+    link: str = "copy",
+    atomic: bool = False,
+    ignore: Iterable[str] = DEFAULT_IGNORE,
+    parse_cache: ParseCache | None = None,
+    io_threads: int = DEFAULT_IO_THREADS,
+    gzip: bool = False,
+    gzip_threshold: int = DEFAULT_GZIP_THRESHOLD,
+    minify: bool = False,
+    fingerprint: bool = False,
+    lazy_images: bool = False,
+    search: bool = False,
+) -> None:
+    if parse_cache is not None:
+        parse_cache.prune()
+    # Passed by keyword, so a new option cannot shift the ones after it
+    options = dict(
+        checksum=checksum,
+        link=link,
+        ignore=ignore,
+        parse_cache=parse_cache,
+        io_threads=io_threads,
+        gzip=gzip,
+        gzip_threshold=gzip_threshold,
+        minify=minify,
+        fingerprint=fingerprint,
+        lazy_images=lazy_images,
+        search=search,
+    )
+    if not atomic:
+        if not incremental:
+            with stats.stage("clean"):
+                clean_output_directory(output)
+        build(basepath, output, incremental, jobs, stats, **options)
+        return
+
+    # Atomic builds always start from the live site, so they are incremental
+    with stats.stage("stage"):
+        staging = stage_output(output)
+    try:
+        build(basepath, staging, True, jobs, stats, **options)
+    except BaseException:
+        discard_output(staging)
+        raise
+    with stats.stage("swap"):
+        swap_output(output, staging)
+
+
+def build(
+    basepath: str,
+    output: str,
+    incremental: bool,
+    jobs: int = 1,
+    stats: BuildStats = NULL_STATS,
+    *,
+    checksum: bool = False,
+    link: str = "copy",
+    ignore: Iterable[str] = DEFAULT_IGNORE,
+    parse_cache: ParseCache | None = None,
+    io_threads: int = DEFAULT_IO_THREADS,
+    gzip: bool = False,
+    gzip_threshold: int = DEFAULT_GZIP_THRESHOLD,
+    minify: bool = False,
+    fingerprint: bool = False,
+    lazy_images: bool = False,
+    search: bool = False,
+) -> None:
+    manifest = load_manifest(output, incremental)
+    with stats.stage("copy_contents"):
+        assets = copy_contents(
+            "./static", output, manifest.assets, checksum, link, stats, ignore
+        )
+        fingerprints = fingerprint_assets(
+            output, assets if fingerprint else {}, manifest.fingerprints, stats
+        )
+        images = image_dimensions(
+            output, assets if lazy_images else {}, manifest.images, stats
+        )
+    generate_pages(
+        "./content",
+        output,
+        "./template.html",
+        basepath,
+        incremental,
+        jobs,
+        stats,
+        assets=assets,
+        ignore=ignore,
+        parse_cache=parse_cache,
+        io_threads=io_threads,
+        minify=minify,
+        fingerprints=fingerprints,
+        images=images,
+        lazy_images=lazy_images,
+        search=search,
+    )
+    update_sidecars(output, gzip, gzip_threshold, stats)
+
+
+def update_sidecars(
+    output: str,
+    gzip: bool,
+    threshold: int = DEFAULT_GZIP_THRESHOLD,
+    stats: BuildStats = NULL_STATS,
+) -> None:
+    manifest_path = os.path.join(output, MANIFEST_NAME)
+    manifest = Manifest.load(manifest_path)
+    if gzip:
+        with stats.stage("compress"):
+            compressed = compress_output(output, manifest.compressed, threshold, stats)
+    else:
+        compressed = {}
+        remove_sidecars(output, manifest.compressed)
+    if compressed != manifest.compressed:
+        manifest.compressed = compressed
+        manifest.save(manifest_path)
 
 
 def clean_output_directory(output: str) -> None:
-    if os.path.exists(output):
+    if os.path.islink(output):
+        os.remove(output)
+    elif os.path.exists(output):
         shutil.rmtree(output)
 
 
-def copy_contents(src: str, dest: str) -> None:
-    contents = get_contents_r(src)
-    for item in contents:
+def load_manifest(dest: str, incremental: bool = True) -> Manifest:
+    if not incremental:
+        return Manifest()
+    return Manifest.load(os.path.join(dest, MANIFEST_NAME))
+
+
+def copy_contents(
+    src: str,
+    dest: str,
+    previous: dict[str, str] | None = None,
+    checksum: bool = False,
+    link: str = "copy",
+    stats: BuildStats = NULL_STATS,
+    ignore: Iterable[str] = DEFAULT_IGNORE,
+) -> dict[str, str]:
+    previous = previous or {}
+    assets = {}
+    for item in iter_files(src, ignore):
         src_file = os.path.join(src, item)
         dest_file = os.path.join(dest, item)
-        os.makedirs(os.path.dirname(dest_file), exist_ok=True)
-        shutil.copy(src_file, dest_file)
+        source = os.stat(src_file)
+        if checksum:
+            assets[item] = hash_file(src_file)
+            unchanged = previous.get(item) == assets[item] and is_current(
+                source, dest_file, compare_mtime=False
+            )
+        else:
+            assets[item] = ""
+            unchanged = is_current(source, dest_file)
+        if unchanged:
+            stats.count("static_skipped")
+            continue
+        install_file(src_file, dest_file, link)
+        stats.count("static_files")
+        stats.count("static_bytes", source.st_size)
+
+    for item in sorted(previous.keys() - assets.keys()):
+        remove_output(dest, item)
+        stats.count("static_removed")
+    return assets
+
+
+def asset_digest(dest_file: str, digest: str) -> str:
+    # Checksum builds know the content hash, others go by size and mtime
+    if digest:
+        return digest
+    stat = os.stat(dest_file)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def fingerprint_assets(
+    dest: str,
+    assets: dict[str, str],
+    previous: dict[str, list] | None = None,
+    stats: BuildStats = NULL_STATS,
+) -> dict[str, list]:
+    previous = previous or {}
+    fingerprints = {}
+    for item, checksum in assets.items():
+        dest_file = os.path.join(dest, item)
+        digest = asset_digest(dest_file, checksum)
+        # A hard linked asset edited in place keeps sharing its inode with the
+        # fingerprinted file, so only the content tells whether it changed
+        cached = previous.get(item)
+        if cached is not None and cached[0] == digest and is_same_file(
+            dest_file, os.path.join(dest, cached[1])
+        ):
+            fingerprints[item] = cached
+            stats.count("fingerprints_cached")
+            continue
+        # Checksum builds already hashed the asset while syncing it
+        name = fingerprinted_name(item, checksum or hash_file(dest_file))
+        install_file(dest_file, os.path.join(dest, name), "hardlink")
+        fingerprints[item] = [digest, name]
+        stats.count("fingerprints_hashed")
+
+    names = {name for _, name in fingerprints.values()}
+    for name in sorted({name for _, name in previous.values()} - names):
+        if os.path.exists(os.path.join(dest, name)):
+            remove_output(dest, name)
+    return fingerprints
 
 
-def generate_pages(src: str, dest: str, template: str, basepath: str) -> None:
-    pages = get_contents_r(src)
-    for page in pages:
-        if not page.endswith(".md"):
+def image_dimensions(
+    dest: str,
+    assets: dict[str, str],
+    previous: dict[str, list] | None = None,
+    stats: BuildStats = NULL_STATS,
+) -> dict[str, list]:
+    previous = previous or {}
+    images = {}
+    for item, digest in assets.items():
+        if not is_image(item):
             continue
-        src_page = os.path.join(src, page)
-        dest_page = os.path.join(dest, page.replace(".md", ".html"))
-        os.makedirs(os.path.dirname(dest_page), exist_ok=True)
-        generate_page(src_page, dest_page, template, basepath)
+        dest_file = os.path.join(dest, item)
+        digest = asset_digest(dest_file, digest)
+        cached = previous.get(item)
+        if cached is not None and cached[0] == digest:
+            images[item] = cached
+            stats.count("images_cached")
+            continue
+        size = image_size(dest_file)
+        if size is not None:
+            images[item] = [digest, *size]
+            stats.count("images_read")
+    return images
 
 
-def get_contents_r(dir: str, root: str = "") -> list[str]:
-    if not root:
-        root = dir
+def compress_output(
+    dest: str,
+    previous: dict[str, str] | None = None,
+    threshold: int = DEFAULT_GZIP_THRESHOLD,
+    stats: BuildStats = NULL_STATS,
+) -> dict[str, str]:
+    previous = previous or {}
+    items = []
+    for item in iter_files(dest, ()):
+        path = os.path.join(dest, item)
+        if is_compressible(item, os.path.getsize(path), threshold):
+            items.append(item)
 
-    paths = []
+    # zlib releases the GIL while compressing, so threads use every core
+    with ThreadPoolExecutor(os.cpu_count()) as executor:
+        results = executor.map(
+            gzip_if_changed,
+            (os.path.join(dest, item) for item in items),
+            (previous.get(item) for item in items),
+        )
+        compressed = {}
+        files = input_bytes = output_bytes = 0
+        for item, (digest, sizes) in zip(items, results):
+            compressed[item] = digest
+            if sizes is not None:
+                files += 1
+                input_bytes += sizes[0]
+                output_bytes += sizes[1]
 
-    for item in os.listdir(dir):
-        item_path = os.path.join(dir, item)
-        if os.path.isfile(item_path):
-            paths.append(os.path.relpath(item_path, root))
-        elif os.path.isdir(item_path):
-            paths.extend(get_contents_r(item_path, root))
+    remove_sidecars(dest, previous.keys() - compressed.keys())
+    stats.count("gzip_files", files)
+    stats.count("gzip_skipped", len(compressed) - files)
+    stats.count("gzip_input_bytes", input_bytes)
+    stats.count("gzip_output_bytes", output_bytes)
+    ratio = f", ratio {input_bytes / output_bytes:.2f}" if output_bytes else ""
+    print(
+        f"Compressed {files} file(s), {len(compressed) - files} up to date: "
+        f"{input_bytes} -> {output_bytes} bytes{ratio}"
+    )
+    return compressed
 
-    return paths
 
+def remove_sidecars(dest: str, items: Iterable[str]) -> None:
+    for item in sorted(items):
+        if os.path.exists(os.path.join(dest, f"{item}{GZIP_SUFFIX}")):
+            remove_output(dest, f"{item}{GZIP_SUFFIX}")
 
-def extract_title(markdown: str) -> str:
-    match = re.match(r"^#\s(.*)", markdown.strip())
-    if not match:
-        raise ValueError("No title header found")
-    return match[1]
 
+def generate_pages(
+    src: str,
+    dest: str,
+    template: str,
+    basepath: str,
+    incremental: bool = False,
+    jobs: int = 1,
+    stats: BuildStats = NULL_STATS,
+    changed: set[str] | None = None,
+    assets: dict[str, str] | None = None,
+    ignore: Iterable[str] = DEFAULT_IGNORE,
+    parse_cache: ParseCache | None = None,
+    resolver: UrlResolver | None = None,
+    io_threads: int = DEFAULT_IO_THREADS,
+    minify: bool = False,
+    fingerprints: dict[str, list] | None = None,
+    images: dict[str, list] | None = None,
+    lazy_images: bool = False,
+    search: bool = False,
+) -> None:
+    manifest_path = os.path.join(dest, MANIFEST_NAME)
+    with stats.stage("discover"):
+        previous = load_manifest(dest, incremental)
+        if fingerprints is None:
+            fingerprints = previous.fingerprints
+        if images is None:
+            images = previous.images
+        sizes = None
+        if lazy_images:
+            sizes = {
+                item: (width, height) for item, (_, width, height) in images.items()
+            }
+        names = {item: name for item, (_, name) in fingerprints.items()}
+        resolver = resolver or UrlResolver(basepath, names, sizes)
+        compiled = load_template(template)
+        current = Manifest(
+            hash_bytes(compiled.source.encode()),
+            hash_bytes(render_context(resolver, minify).encode()),
+            assets=assets if assets is not None else previous.assets,
+            compressed=previous.compressed,
+            fingerprints=fingerprints,
+            images=images,
+        )
+        rebuild_all = current.invalidates_all(previous)
+        index = None
+        if search:
+            index = SearchIndex(os.path.join(dest, SEARCH_DIRECTORY))
+            if not rebuild_all:
+                index = SearchIndex.load(index.directory)
+                # Pages indexed by no earlier build have to be parsed again
+                indexed = (page in previous.search for page in previous.pages)
+                if not all(indexed) or not index.covers(previous.search.values()):
+                    rebuild_all = True
+                    index = SearchIndex(index.directory)
+        compiled = compiled.resolve_urls(resolver)
+        if minify:
+            compiled = compiled.minify()
 
-def generate_page(src: str, dest: str, template: str, basepath: str) -> None:
-    print(f"Generating page from {src} to {dest} using {template}")
+    if changed is None:
+        pages: Iterable[str] = iter_files(src, ignore)
+    else:
+        # The caller knows what changed, so the previous build lists the rest
+        known = [page for page in previous.pages if page not in changed]
+        known.extend(
+            page for page in changed if os.path.isfile(os.path.join(src, page))
+        )
+        pages = sorted(known)
 
-    with open(src) as file:
-        source_contents = file.read()
+    tasks = []
 
-    with open(template) as file:
-        template_contents = file.read()
+    def iter_tasks() -> Iterator[tuple]:
+        # Pages are rendered while the walk is still discovering later ones
+        for page in pages:
+            if not page.endswith(".md"):
+                continue
+            src_page = os.path.join(src, page)
+            if changed is not None and page not in changed and page in previous.pages:
+                # Trust the manifest for pages the caller knows are unchanged
+                current.pages[page] = previous.pages[page]
+                if not rebuild_all:
+                    stats.count("pages_skipped")
+                    continue
+            else:
+                current.pages[page] = hash_file(src_page)
+            dest_page = os.path.join(dest, page_output_path(page))
+            if (
+                not rebuild_all
+                and previous.pages.get(page) == current.pages[page]
+                and os.path.exists(dest_page)
+            ):
+                stats.count("pages_skipped")
+                continue
+            os.makedirs(os.path.dirname(dest_page), exist_ok=True)
+            args = (
+                src_page,
+                dest_page,
+                compiled,
+                resolver,
+                stats.enabled,
+                parse_cache,
+                minify,
+                search,
+            )
+            tasks.append((page, args))
+            yield args
 
-    markdown = markdown_to_html(source_contents)
-    title = extract_title(source_contents)
+    errors = []
+    entries = {}
+    # Worker processes each do their own I/O, a serial build overlaps it instead
+    io = IOPool(io_threads) if io_threads > 0 and resolve_jobs(jobs) == 1 else None
+    with stats.stage("pages"):
+        try:
+            # The walk runs while pages render, its share is added to discover
+            args = stats.timed("discover", iter_tasks())
+            if io is not None:
+                args = _read_ahead(args, io)
+            results = run_tasks(_try_generate_page, args, jobs)
+            for position, (error, page_stats, entry) in enumerate(results):
+                page, args = tasks[position]
+                print(f"Generating page from {args[0]} to {args[1]} using {template}")
+                if page_stats is not None:
+                    stats.merge(page_stats)
+                if entry is not None:
+                    entries[page] = entry
+                if error is not None:
+                    errors.append((args[0], error))
+                    current.pages[page] = ""
+                    stats.count("pages_failed")
+        finally:
+            failed_writes = io.close() if io is not None else []
 
-    html = (
-        template_contents.replace("{{ Title }}", title)
-        .replace("{{ Content }}", markdown.to_html())
-        .replace('href="/', f'href="{basepath}')
-        .replace('src="/', f'src="{basepath}')
+        # Writes finish after their page was reported, so failures come last
+        pages_by_output = {args[1]: (page, args[0]) for page, args in tasks}
+        for dest_page, error in failed_writes:
+            page, src_page = pages_by_output[dest_page]
+            errors.append((src_page, error))
+            current.pages[page] = ""
+            entries.pop(page, None)
+            stats.count("pages_failed")
+        if io is not None and tasks:
+            stats.count("io_peak_in_flight", io.peak)
+
+    if index is not None:
+        with stats.stage("search"):
+            current.search = update_index(
+                index, previous.search, current.pages, entries, resolver, stats
+            )
+    elif previous.search:
+        remove_index(os.path.join(dest, SEARCH_DIRECTORY))
+
+    with stats.stage("cleanup"):
+        for page in sorted(previous.pages.keys() - current.pages.keys()):
+            remove_output(dest, page_output_path(page))
+            stats.count("pages_removed")
+
+        os.makedirs(dest, exist_ok=True)
+        current.save(manifest_path)
+    if errors:
+        raise BuildError(errors)
+
+
+def update_index(
+    index: SearchIndex,
+    previous: dict[str, int],
+    pages: dict[str, str],
+    entries: dict[str, SearchEntry],
+    resolver: UrlResolver,
+    stats: BuildStats = NULL_STATS,
+) -> dict[str, int]:
+    # Only rendered, failed and removed pages change, the rest keep their ids
+    search = {}
+    stale = []
+    for page, doc_id in previous.items():
+        if page in entries or not pages.get(page):
+            stale.append(doc_id)
+        else:
+            search[page] = doc_id
+    index.remove(stale)
+    # Pages that were indexed before are added first to get their ids back
+    for page in sorted(entries, key=lambda page: page not in previous):
+        url = resolver.resolve("/" + page_url(page))
+        search[page] = index.add(url, entries[page], previous.get(page))
+    written = index.save()
+    size = index.size()
+    stats.count("search_pages", len(entries))
+    stats.count("search_files_written", written)
+    stats.count("search_index_bytes", size)
+    print(
+        f"Indexed {len(entries)} page(s) for search, "
+        f"{written} file(s) written, {size} bytes"
     )
+    return search
+
+
+def watch(
+    basepath: str,
+    output: str,
+    jobs: int = 1,
+    port: int = 8000,
+    interval: float = 0.1,
+    *,
+    checksum: bool = False,
+    link: str = "copy",
+    ignore: Iterable[str] = DEFAULT_IGNORE,
+    parse_cache: ParseCache | None = None,
+    io_threads: int = DEFAULT_IO_THREADS,
+    gzip: bool = False,
+    gzip_threshold: int = DEFAULT_GZIP_THRESHOLD,
+    minify: bool = False,
+    fingerprint: bool = False,
+    lazy_images: bool = False,
+    search: bool = False,
+    atomic: bool = False,
+) -> None:
+    template = load_template("./template.html")
+    watcher = Watcher(["./content", "./static", *template.files], ignore)
+    reload = LiveReload()
+    server = start_server(output, port, basepath, reload)
+    print(f"Serving {output} at http://localhost:{port}{basepath}")
+    try:
+        while True:
+            time.sleep(interval)
+            changes = watcher.poll()
+            if not changes:
+                continue
+            started = time.perf_counter()
+            try:
+                rebuild(
+                    changes,
+                    basepath,
+                    output,
+                    jobs,
+                    checksum=checksum,
+                    link=link,
+                    ignore=ignore,
+                    parse_cache=parse_cache,
+                    io_threads=io_threads,
+                    gzip=gzip,
+                    gzip_threshold=gzip_threshold,
+                    minify=minify,
+                    fingerprint=fingerprint,
+                    lazy_images=lazy_images,
+                    search=search,
+                    atomic=atomic,
+                )
+            except (BuildError, OSError, ValueError) as error:
+                print(error)
+            watcher.paths[2:] = load_template("./template.html").files
+            reload.notify()
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"Rebuilt {len(changes)} changed file(s) in {elapsed:.1f} ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+def rebuild(
+    changes: set[str],
+    basepath: str,
+    output: str,
+    jobs: int = 1,
+    *,
+    checksum: bool = False,
+    link: str = "copy",
+    ignore: Iterable[str] = DEFAULT_IGNORE,
+    parse_cache: ParseCache | None = None,
+    io_threads: int = DEFAULT_IO_THREADS,
+    gzip: bool = False,
+    gzip_threshold: int = DEFAULT_GZIP_THRESHOLD,
+    minify: bool = False,
+    fingerprint: bool = False,
+    lazy_images: bool = False,
+    search: bool = False,
+    atomic: bool = False,
+) -> None:
+    pages: set[str] | None = set()
+    static = False
+    for path in changes:
+        if path.startswith(os.path.join("./static", "")):
+            static = True
+        elif path.startswith(os.path.join("./content", "")):
+            if pages is not None:
+                pages.add(os.path.relpath(path, "./content"))
+        else:
+            pages = None
+
+    live = output
+    if atomic:
+        # The live generation is never written to, the rebuild is staged and
+        # swapped in like a full atomic build
+        output = stage_output(live)
+    try:
+        assets = fingerprints = images = None
+        if static:
+            previous = load_manifest(output)
+            assets = copy_contents(
+                "./static", output, previous.assets, checksum, link, ignore=ignore
+            )
+            fingerprints = fingerprint_assets(
+                output, assets if fingerprint else {}, previous.fingerprints
+            )
+            images = image_dimensions(
+                output, assets if lazy_images else {}, previous.images
+            )
+        generate_pages(
+            "./content",
+            output,
+            "./template.html",
+            basepath,
+            True,
+            jobs,
+            changed=pages,
+            assets=assets,
+            ignore=ignore,
+            parse_cache=parse_cache,
+            io_threads=io_threads,
+            minify=minify,
+            fingerprints=fingerprints,
+            images=images,
+            lazy_images=lazy_images,
+            search=search,
+        )
+        # Unchanged files keep their sidecars, compress_output compares hashes
+        update_sidecars(output, gzip, gzip_threshold)
+    except BaseException:
+        if atomic:
+            discard_output(output)
+        raise
+    if atomic:
+        swap_output(live, output)
+
+
+def resolve_jobs(jobs: int) -> int:
+    return jobs if jobs != 0 else os.cpu_count() or 1
+
+
+def run_tasks(func, args: Iterable[tuple], jobs: int) -> Iterator:
+    jobs = resolve_jobs(jobs)
+    args = iter(args)
+    head = list(itertools.islice(args, 2 if jobs > 1 else 0))
+    if len(head) < 2:
+        return (func(*arg) for arg in itertools.chain(head, args))
+    return _map_in_processes(func, itertools.chain(head, args), jobs)
+
+
+def _map_in_processes(func, args: Iterator[tuple], jobs: int) -> Iterator:
+    # map submits chunks as it consumes args, so workers start on the first
+    # pages while later ones are still being discovered
+    # Workers may be spawned rather than forked, so pass on the cache size
+    with ProcessPoolExecutor(
+        jobs, initializer=set_block_cache_size, initargs=(block_cache.maxsize,)
+    ) as executor:
+        yield from executor.map(
+            _apply, itertools.repeat(func), args, chunksize=TASK_CHUNKSIZE
+        )
+
+
+def _apply(func, args: tuple):
+    return func(*args)
+
+
+def _read_ahead(tasks: Iterator[tuple], io: IOPool) -> Iterator[tuple]:
+    # I/O threads read the sources of the next pages while this one renders
+    window: deque[tuple] = deque()
+    for args in tasks:
+        src, _, _, resolver, _, parse_cache, minify, search = args
+        context = render_context(resolver, minify)
+        io.prefetch(src, read_page, src, parse_cache, context, search)
+        window.append((*args, io))
+        if len(window) > io.limit:
+            yield window.popleft()
+    yield from window
+
+
+def _try_generate_page(
+    src: str,
+    dest: str,
+    template: Template,
+    resolver: UrlResolver,
+    collect_stats: bool,
+    parse_cache: ParseCache | None = None,
+    minify: bool = False,
+    search: bool = False,
+    io: IOPool | None = None,
+) -> tuple[Exception | None, BuildStats | None, SearchEntry | None]:
+    # Workers collect into their own stats, merged by the parent in page order
+    stats = BuildStats() if collect_stats else None
+    try:
+        entry = generate_page(
+            src,
+            dest,
+            template,
+            resolver,
+            stats or NULL_STATS,
+            parse_cache,
+            minify,
+            search,
+            io,
+        )
+    except Exception as error:
+        return error, stats, None
+    return None, stats, entry
+
+
+def page_output_path(page: str) -> str:
+    return page.replace(".md", ".html")
+
+
+def page_url(page: str) -> str:
+    path = page_output_path(page).replace(os.sep, "/")
+    return path.removesuffix("index.html")
+
+
+def remove_output(dest: str, path: str) -> None:
+    dest_file = os.path.join(dest, path)
+    print(f"Removing stale file {dest_file}")
+    if os.path.exists(dest_file):
+        os.remove(dest_file)
+
+    root = os.path.abspath(dest)
+    directory = os.path.dirname(os.path.abspath(dest_file))
+    while directory != root and os.path.isdir(directory) and not os.listdir(directory):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+
+def generate_page(
+    src: str,
+    dest: str,
+    template: Template,
+    resolver: UrlResolver,
+    stats: BuildStats = NULL_STATS,
+    parse_cache: ParseCache | None = None,
+    minify: bool = False,
+    search: bool = False,
+    io: IOPool | None = None,
+) -> SearchEntry | None:
+    started = time.perf_counter()
+    context = render_context(resolver, minify)
+    with stats.stage("read"):
+        if io is None:
+            source_contents, content, text = read_page(
+                src, parse_cache, context, search
+            )
+        else:
+            source_contents, content, text = io.take(src)
+    if search and text is None:
+        content = None  # The text for the index only comes out of parsing
+
+    document = None
+    hits, misses = block_cache.hits, block_cache.misses
+    with stats.stage("parse"):
+        if content is None:
+            document = parse_markdown(
+                source_contents,
+                resolver=resolver,
+                minify=minify,
+                search=search,
+                count=stats.enabled,
+            )
+            title = document.title
+            text = document.text
+        else:
+            title = extract_title(source_contents)
+    if title is None:
+        raise ValueError("No title header found")
+
+    nodes = 0
+    if document is not None:
+        nodes = document.nodes
+        # Without a parse cache nothing keeps the markup, so the tree is
+        # streamed through the template into the page
+        content = document.html
+        if parse_cache is not None:
+            with stats.stage("serialize"):
+                content = document.html.to_html(minify)
+            puts = [(content, context)]
+            if search:
+                puts.append((text, TEXT_CONTEXT))
+            for value, key in puts:
+                if io is None:
+                    parse_cache.put(source_contents, value, key)
+                else:
+                    io.write(dest, parse_cache.put, source_contents, value, key)
+            stats.count("parse_cache_misses")
+    else:
+        stats.count("parse_cache_hits")
+
+    with stats.stage("template"):
+        chunks = template.iter_render(Title=escape(title), Content=content)
+        if stats.enabled:
+            chunks = counter = ByteCounter(chunks)
+        if io is not None:
+            # The write is queued, so the page is rendered before it is handed over
+            chunks = list(chunks)
+
+    with stats.stage("write"):
+        if io is None:
+            write_chunks(dest, chunks)
+        else:
+            io.write(dest, write_chunks, dest, chunks)
+
+    entry = None
+    if search:
+        with stats.stage("tokenize"):
+            entry = SearchEntry(title, tokenize(text))
+
+    if stats.enabled:
+        input_bytes = os.path.getsize(src)
+        output_bytes = counter.size
+        stats.count("pages_rendered")
+        stats.count("html_nodes", nodes)
+        stats.count("input_bytes", input_bytes)
+        stats.count("output_bytes", output_bytes)
+        stats.count("block_cache_hits", block_cache.hits - hits)
+        stats.count("block_cache_misses", block_cache.misses - misses)
+        stats.add_page(
+            src,
+            wall=time.perf_counter() - started,
+            nodes=nodes,
+            input_bytes=input_bytes,
+            output_bytes=output_bytes,
+        )
+    return entry
+
+
+def render_context(resolver: UrlResolver, minify: bool) -> str:
+    # Everything besides the source that changes a page's rendered content
+    return f"{resolver.key},minify" if minify else resolver.key
+
 
-    with open(dest, "w") as file:
-        os.makedirs(os.path.dirname(dest), exist_ok=True)
-        file.write(html)
+def read_page(
+    src: str, parse_cache: ParseCache | None, context: str, search: bool = False
+) -> tuple[str, str | None, str | None]:
+    source_contents = read_text(src)
+    if parse_cache is None:
+        return source_contents, None, None
+    content = parse_cache.get(source_contents, context)
+    text = None
+    if search and content is not None:
+        text = parse_cache.get(source_contents, TEXT_CONTEXT)
+    return source_contents, content, text
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--basepath", default="/")
     parser.add_argument("--output", default="./public")
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--stats", nargs="?", const="build_stats.json")
+    parser.add_argument("--slowest", type=int, default=10)
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--interval", type=float, default=0.1)
+    parser.add_argument("--checksum", action="store_true")
+    parser.add_argument("--link", choices=LINK_MODES, default="copy")
+    parser.add_argument("--atomic", action="store_true")
+    parser.add_argument("--ignore", action="append", default=[])
+    parser.add_argument("--block-cache", type=int, default=DEFAULT_BLOCK_CACHE_SIZE)
+    parser.add_argument("--parse-cache", default=PARSE_CACHE_DIRECTORY)
+    parser.add_argument("--no-parse-cache", action="store_true")
+    parser.add_argument("--io-threads", type=int, default=DEFAULT_IO_THREADS)
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--gzip-threshold", type=int, default=DEFAULT_GZIP_THRESHOLD)
+    parser.add_argument("--minify", action="store_true")
+    parser.add_argument("--fingerprint", action="store_true")
+    parser.add_argument("--lazy-images", action="store_true")
+    parser.add_argument("--search", action="store_true")
     args = parser.parse_args()
-    main(args.basepath, args.output)
+    set_block_cache_size(args.block_cache)
+    parse_cache = None if args.no_parse_cache else ParseCache(args.parse_cache)
+    stats = BuildStats() if args.stats else NULL_STATS
+    try:
+        with stats.stage("total"):
+            main(
+                args.basepath,
+                args.output,
+                args.incremental,
+                args.jobs,
+                stats,
+                checksum=args.checksum,
+                link=args.link,
+                atomic=args.atomic,
+                ignore=(*DEFAULT_IGNORE, *args.ignore),
+                parse_cache=parse_cache,
+                io_threads=args.io_threads,
+                gzip=args.gzip,
+                gzip_threshold=args.gzip_threshold,
+                minify=args.minify,
+                fingerprint=args.fingerprint,
+                lazy_images=args.lazy_images,
+                search=args.search,
+            )
+    except BuildError as error:
+        if not args.watch:
+            sys.exit(str(error))
+        print(error)
+    finally:
+        if stats.enabled:
+            print(stats.summary(args.slowest))
+            stats.save(args.stats, args.slowest)
+    if args.watch:
+        watch(
+            args.basepath,
+            args.output,
+            args.jobs,
+            args.port,
+            args.interval,
+            checksum=args.checksum,
+            link=args.link,
+            ignore=(*DEFAULT_IGNORE, *args.ignore),
+            parse_cache=parse_cache,
+            io_threads=args.io_threads,
+            gzip=args.gzip,
+            gzip_threshold=args.gzip_threshold,
+            minify=args.minify,
+            fingerprint=args.fingerprint,
+            lazy_images=args.lazy_images,
+            search=args.search,
+            atomic=args.atomic,
+        )
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = ".manifest.json"
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(1 << 16):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    def __init__(
+        self,
+        template: str = "",
+        basepath: str = "",
+        pages: dict[str, str] | None = None,
+        assets: dict[str, str] | None = None,
+        compressed: dict[str, str] | None = None,
+        fingerprints: dict[str, list] | None = None,
+        images: dict[str, list] | None = None,
+        search: dict[str, int] | None = None,
+    ) -> None:
+        self.template = template
+        self.basepath = basepath
+        self.pages = pages if pages is not None else {}
+        self.assets = assets if assets is not None else {}
+        self.compressed = compressed if compressed is not None else {}
+        self.fingerprints = fingerprints if fingerprints is not None else {}
+        self.images = images if images is not None else {}
+        self.search = search if search is not None else {}
+
+    @classmethod
+    def load(cls, path: str) -> "Manifest":
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls()
+        return cls(
+            data.get("template", ""),
+            data.get("basepath", ""),
+            data.get("pages"),
+            data.get("assets"),
+            data.get("compressed"),
+            data.get("fingerprints"),
+            data.get("images"),
+            data.get("search"),
+        )
+
+    def save(self, path: str) -> None:
+        data = {
+            "template": self.template,
+            "basepath": self.basepath,
+            "pages": self.pages,
+            "assets": self.assets,
+            "compressed": self.compressed,
+            "fingerprints": self.fingerprints,
+            "images": self.images,
+            "search": self.search,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as file:
+            # Without indent json uses its C encoder, which matters for large sites
+            file.write(json.dumps(data, sort_keys=True))
+        os.replace(tmp_path, path)
+
+    def invalidates_all(self, other: "Manifest") -> bool:
+        return self.template != other.template or self.basepath != other.basepath
+
+    def __eq__(self, value: object, /) -> bool:
+        return (
+            isinstance(value, Manifest)
+            and self.template == value.template
+            and self.basepath == value.basepath
+            and self.pages == value.pages
+            and self.assets == value.assets
+            and self.compressed == value.compressed
+            and self.fingerprints == value.fingerprints
+            and self.images == value.images
+            and self.search == value.search
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Manifest({self.template}, {self.basepath}, {self.pages}, "
+            f"{self.assets}, {self.compressed}, {self.fingerprints}, {self.images}, "
+            f"{self.search})"
+        )
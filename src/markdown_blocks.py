@@ -1,12 +1,156 @@
-from src.blocknode import BlockNode
-from src.htmlnode import ParentNode
+import io
+import re
+from collections.abc import Iterable, Iterator
+
+from src.blocknode import BlockNode, Heading
+from src.cache import LRUCache, block_cache
+from src.htmlnode import HTMLNode, ParentNode, RawNode
+from src.stats import count_nodes
+from src.urls import UrlResolver
+
+FENCE = "```"
+TITLE_PATTERN = re.compile(r"\s*# (.*)")
+
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[BlockNode]:
+    block: list[str] = []
+    in_fence = False
+    for line in lines:
+        if in_fence:
+            in_fence = line.count(FENCE) % 2 == 0
+        elif line == "\n":
+            yield from _to_block(block)
+            block = []
+            continue
+        else:
+            in_fence = line.lstrip().startswith(FENCE) and line.count(FENCE) % 2 == 1
+        block.append(line)
+    yield from _to_block(block)
+
+
+def _to_block(lines: list[str]) -> Iterator[BlockNode]:
+    markdown = "".join(lines)
+    if markdown.strip() != "":
+        yield BlockNode(markdown.removesuffix("\n"))
 
 
 def markdown_to_blocks(markdown: str) -> list[BlockNode]:
-    return [BlockNode(m) for m in markdown.split("\n\n") if m.strip() != ""]
+    return list(iter_blocks(io.StringIO(markdown)))
+
+
+class Document:
+    __slots__ = ("html", "title", "headings", "text", "nodes")
+
+    def __init__(
+        self,
+        html: ParentNode,
+        title: str | None,
+        headings: list[Heading],
+        text: str | None = None,
+        nodes: int = 0,
+    ) -> None:
+        self.html = html
+        self.title = title
+        self.headings = headings
+        self.text = text
+        # Nodes rendered by this parse, blocks served by the cache add none
+        self.nodes = nodes
+
+    def __repr__(self) -> str:
+        return f"Document({self.title!r}, {len(self.headings)} headings)"
+
+
+def parse_markdown(
+    markdown: str,
+    cache: LRUCache | None = block_cache,
+    resolver: UrlResolver | None = None,
+    minify: bool = False,
+    search: bool = False,
+    count: bool = False,
+) -> Document:
+    prefix = "" if resolver is None else f"{resolver.key}\0"
+    if minify:
+        prefix += "minify\0"
+    children: list[HTMLNode] = []
+    headings: list[Heading] = []
+    text: list[str] | None = [] if search else None
+    rendered: list[HTMLNode] | None = [] if count else None
+    title = None
+    for block in markdown_to_blocks(markdown):
+        heading = block.heading
+        if heading is not None:
+            if not children:
+                title = _title(heading)
+            headings.append(heading)
+        if cache is None:
+            node = block.to_html_node(resolver, text)
+            if rendered is not None:
+                rendered.append(node)
+            children.append(node)
+        else:
+            children.append(
+                _cached_html_node(
+                    block, cache, resolver, prefix, minify, text, rendered
+                )
+            )
+    html = ParentNode("div", children)
+    document = Document(html, title, headings)
+    if text is not None:
+        document.text = " ".join(text)
+    if rendered is not None:
+        document.nodes = 1 + sum(map(count_nodes, rendered))
+    return document
+
+
+def markdown_to_html(
+    markdown: str,
+    cache: LRUCache | None = block_cache,
+    resolver: UrlResolver | None = None,
+    minify: bool = False,
+) -> ParentNode:
+    return parse_markdown(markdown, cache, resolver, minify).html
+
+
+def extract_title(markdown: str) -> str | None:
+    # For sources that are not parsed: the title can only be the first line of
+    # the first block, so match it in place without splitting the document
+    match = TITLE_PATTERN.match(markdown)
+    return match[1] if match else None
+
+
+def _title(heading: Heading) -> str | None:
+    return heading.text.partition("\n")[0] if heading.level == 1 else None
+
+
+def _cached_html_node(
+    block: BlockNode,
+    cache: LRUCache,
+    resolver: UrlResolver | None,
+    prefix: str,
+    minify: bool = False,
+    text: list[str] | None = None,
+    rendered: list[HTMLNode] | None = None,
+) -> HTMLNode:
+    # Resolved URLs and minified markup end up in the HTML, so both are keyed.
+    # An entry holds the markup and the text of the block, so searching builds
+    # look each block up once
+    key = prefix + block.markdown
+    entry = cache.get(key)
+    if entry is None or (text is not None and entry[1] is None):
+        words: list[str] | None = None if text is None else []
+        node = block.to_html_node(resolver, words)
+        if rendered is not None:
+            rendered.append(node)
+        entry = (node.to_html(minify), None if words is None else " ".join(words))
+        cache.put(key, entry)
+    html, block_text = entry
+    if text is not None:
+        text.append(block_text)
+    return RawNode(html)
 
 
-def markdown_to_html(markdown: str) -> ParentNode:
-    blocks = markdown_to_blocks(markdown)
-    html_nodes = [block.to_html_node() for block in blocks]
-    return ParentNode("div", html_nodes)
+def stream_markdown_to_html(
+    lines: Iterable[str], resolver: UrlResolver | None = None
+) -> ParentNode:
+    blocks = iter_blocks(lines)
+    return ParentNode("div", (block.to_html_node(resolver) for block in blocks))
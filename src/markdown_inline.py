@@ -1,5 +1,16 @@
+import re
+
 from src.textnode import TextNode, TextType
 
+INLINE_PATTERN = re.compile(r"[*_`\[]")
+IMAGE_PATTERN = re.compile(r"!\[(.*?)]\((.*?)\)")
+LINK_PATTERN = re.compile(r"\[(.*?)]\((.*?)\)")
+
+# Delimiters in the order they take precedence. A delimiter may appear literally
+# inside a span opened by an earlier one, but meeting an earlier delimiter inside
+# a later span is unbalanced markup.
+DELIMITERS = {"**": TextType.BOLD, "_": TextType.ITALIC, "`": TextType.CODE}
+
 
 def split_nodes_delimiter(
     old_nodes: list[TextNode], delimiter: str, text_type: TextType
@@ -55,10 +66,84 @@ def split_nodes_link(old_nodes: list[TextNode]) -> list[TextNode]:
 
 
 def to_textnodes(old_nodes: list[TextNode]) -> list[TextNode]:
-    new_nodes = old_nodes.copy()
-    new_nodes = split_nodes_delimiter(new_nodes, "**", TextType.BOLD)
-    new_nodes = split_nodes_delimiter(new_nodes, "_", TextType.ITALIC)
-    new_nodes = split_nodes_delimiter(new_nodes, "`", TextType.CODE)
-    new_nodes = split_nodes_image(new_nodes)
-    new_nodes = split_nodes_link(new_nodes)
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        new_nodes.extend(text_to_textnodes(node.text))
     return new_nodes
+
+
+def text_to_textnodes(text: str) -> list[TextNode]:
+    if "**" not in text and "_" not in text and "`" not in text and "[" not in text:
+        return [TextNode(text, TextType.TEXT)] if text else []
+
+    nodes = []
+    start = position = 0
+    while match := INLINE_PATTERN.search(text, position):
+        index = match.start()
+        token = match[0]
+        if token == "*":
+            if not text.startswith("**", index):
+                position = index + 1
+                continue
+            token = "**"
+
+        if token in DELIMITERS:
+            content_start = index + len(token)
+            end = _find_closing_delimiter(text, token, content_start)
+            if index > start:
+                nodes.append(TextNode(text[start:index], TextType.TEXT))
+            if end > content_start:
+                nodes.append(TextNode(text[content_start:end], DELIMITERS[token]))
+            start = position = end + len(token)
+            continue
+
+        is_image = index > 0 and text[index - 1] == "!"
+        if is_image:
+            index -= 1
+        found = _match_image_or_link(text, index, is_image)
+        if found is None:
+            position = match.end()
+            continue
+        if index > start:
+            nodes.append(TextNode(text[start:index], TextType.TEXT))
+        text_type = TextType.IMAGE if is_image else TextType.LINK
+        nodes.append(TextNode(found[1], text_type, found[2]))
+        start = position = found.end()
+
+    if start < len(text):
+        nodes.append(TextNode(text[start:], TextType.TEXT))
+    return nodes
+
+
+def _find_closing_delimiter(text: str, delimiter: str, start: int) -> int:
+    end = text.find(delimiter, start)
+    if end == -1:
+        raise ValueError("Invalid markdown syntax")
+    for earlier in DELIMITERS:
+        if earlier == delimiter:
+            break
+        if text.find(earlier, start, end) != -1:
+            raise ValueError("Invalid markdown syntax")
+    return end
+
+
+def _match_image_or_link(text: str, start: int, is_image: bool) -> re.Match | None:
+    pattern = IMAGE_PATTERN if is_image else LINK_PATTERN
+    found = pattern.match(text, start)
+    if found is None or _has_delimiter(found[0]):
+        return None
+    if not is_image:
+        # Images are extracted before links, so a link swallowing one is not a link
+        image_start = text.find("![", start + 1, found.end())
+        while image_start != -1:
+            if _match_image_or_link(text, image_start, True) is not None:
+                return None
+            image_start = text.find("![", image_start + 1, found.end())
+    return found
+
+
+def _has_delimiter(text: str) -> bool:
+    return "**" in text or "_" in text or "`" in text
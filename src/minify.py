@@ -0,0 +1,94 @@
+import re
+from collections.abc import Collection
+
+from src.htmlnode import VOID_ELEMENTS
+
+TOKEN_PATTERN = re.compile(r"<!--.*?-->|<[^>]*>|<[^>]*$|[^<]+|<", re.S)
+TAG_NAME_PATTERN = re.compile(r"</?\s*([^\s/>]+)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Contents of these are rendered as written
+RAW_TEXT_ELEMENTS = frozenset({"pre", "textarea", "script", "style"})
+# Whitespace next to these tags is not rendered
+BLOCK_ELEMENTS = frozenset(
+    "!doctype address article aside base blockquote body br dd details div dl dt "
+    "fieldset figcaption figure footer form h1 h2 h3 h4 h5 h6 head header hr html "
+    "li link main meta nav noscript ol p pre script section style summary table "
+    "tbody td tfoot th thead title tr ul".split()
+)
+
+
+class Token:
+    __slots__ = ("part", "kind", "text", "name")
+
+    def __init__(self, part: int, kind: str, text: str, name: str = "") -> None:
+        self.part = part
+        self.kind = kind
+        self.text = text
+        self.name = name
+
+
+def minify_parts(parts: list[str], slots: Collection[int]) -> list[str]:
+    tokens = _tokenize(parts, slots)
+    minified = [""] * len(parts)
+    raw = None
+    for index, token in enumerate(tokens):
+        text = token.text
+        if token.kind == "tag":
+            if raw is None and token.name in RAW_TEXT_ELEMENTS:
+                raw = token.name
+            elif raw is not None and text.startswith("</") and token.name == raw:
+                raw = None
+            elif raw is None and token.name in VOID_ELEMENTS and text.endswith("/>"):
+                text = text[:-2].rstrip() + ">"
+        elif raw is not None:
+            pass
+        elif token.kind == "comment":
+            text = ""
+        elif token.kind == "text":
+            text = WHITESPACE_PATTERN.sub(" ", text)
+            if _is_break(tokens, index, -1):
+                text = text.lstrip()
+            if _is_break(tokens, index, 1):
+                text = text.rstrip()
+        minified[token.part] += text
+    return minified
+
+
+def _tokenize(parts: list[str], slots: Collection[int]) -> list[Token]:
+    tokens = []
+    in_tag = False
+    for index, part in enumerate(parts):
+        if index in slots:
+            tokens.append(Token(index, "slot", part))
+            continue
+        position = 0
+        if in_tag:
+            # A slot inside a tag, as in href="{{ Url }}", keeps the rest as is
+            end = part.find(">")
+            position = len(part) if end == -1 else end + 1
+            tokens.append(Token(index, "verbatim", part[:position]))
+            in_tag = end == -1
+        for match in TOKEN_PATTERN.finditer(part, position):
+            text = match[0]
+            if text.startswith("<!--"):
+                tokens.append(Token(index, "comment", text))
+            elif text.startswith("<") and text.endswith(">"):
+                name = TAG_NAME_PATTERN.match(text)
+                name = name[1].lower() if name else ""
+                tokens.append(Token(index, "tag", text, name))
+            elif text.startswith("<"):
+                tokens.append(Token(index, "verbatim", text))
+                in_tag = True
+            else:
+                tokens.append(Token(index, "text", text))
+    return tokens
+
+
+def _is_break(tokens: list[Token], index: int, step: int) -> bool:
+    index += step
+    while 0 <= index < len(tokens) and tokens[index].kind == "comment":
+        index += step
+    if not 0 <= index < len(tokens):
+        return True
+    return tokens[index].kind == "tag" and tokens[index].name in BLOCK_ELEMENTS
@@ -0,0 +1,71 @@
+import functools
+import hashlib
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+
+from src.manifest import hash_bytes
+
+PARSER_MODULES = (
+    "src.blocknode",
+    "src.htmlnode",
+    "src.markdown_blocks",
+    "src.markdown_inline",
+    "src.textnode",
+    "src.urls",
+)
+
+
+@functools.cache
+def parser_version() -> str:
+    digest = hashlib.sha256(f"{sys.version_info[:2]}".encode())
+    for name in PARSER_MODULES:
+        with open(importlib.import_module(name).__file__, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+class ParseCache:
+    def __init__(self, directory: str, version: str | None = None) -> None:
+        self.directory = directory
+        self.version = version if version is not None else parser_version()[:16]
+
+    def path(self, source: str, context: str = "") -> str:
+        key = hash_bytes(f"{context}\0{source}".encode())
+        return os.path.join(self.directory, self.version, key[:2], f"{key}.html")
+
+    def get(self, source: str, context: str = "") -> str | None:
+        try:
+            with open(self.path(source, context)) as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def put(self, source: str, content: str, context: str = "") -> None:
+        path = self.path(source, context)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # A unique temporary name keeps concurrent writers from clobbering
+            # each other's partial files before the atomic rename
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as file:
+                    file.write(content)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError:
+            pass  # The cache is best effort, a failed write only costs a re-parse
+
+    def prune(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for entry in os.listdir(self.directory):
+            if entry != self.version:
+                shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+    def __repr__(self) -> str:
+        return f"ParseCache({self.directory!r}, {self.version!r})"
@@ -0,0 +1,210 @@
+import json
+import os
+import re
+import shutil
+from collections import Counter
+from collections.abc import Iterable
+from itertools import chain
+
+from src.fileio import read_text, write_chunks
+
+SEARCH_DIRECTORY = "search"
+DOCS_NAME = "docs.json"
+SHARD_PREFIX_LENGTH = 2
+TERM_PATTERN = re.compile(r"\w{2,}")
+# Parse cache context for the text of a page, no render option changes it
+TEXT_CONTEXT = "search-text"
+
+
+def tokenize(text: str) -> dict[str, int]:
+    return Counter(TERM_PATTERN.findall(text.casefold()))
+
+
+def shard_name(term: str) -> str:
+    prefix = term[:SHARD_PREFIX_LENGTH]
+    if prefix.isascii() and prefix.isalnum():
+        return prefix
+    # Hex names are longer than plain ones, so the two never collide
+    return "x" + prefix.encode().hex()
+
+
+class SearchEntry:
+    __slots__ = ("title", "terms")
+
+    def __init__(self, title: str, terms: dict[str, int]) -> None:
+        self.title = title
+        self.terms = terms
+
+    def __eq__(self, value: object, /) -> bool:
+        return (
+            isinstance(value, SearchEntry)
+            and self.title == value.title
+            and self.terms == value.terms
+        )
+
+    def __repr__(self) -> str:
+        return f"SearchEntry({self.title!r}, {len(self.terms)} terms)"
+
+
+class SearchIndex:
+    __slots__ = (
+        "directory",
+        "docs",
+        "postings",
+        "_free",
+        "_dirty",
+        "_removed",
+        "_saved",
+        "_unloaded",
+    )
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        # Doc ids index this list, removed pages leave None so ids stay stable
+        self.docs: list[list[str] | None] = []
+        self.postings: dict[str, dict[int, int]] = {}
+        self._free: list[int] = []
+        # Terms whose postings changed since the last save
+        self._dirty: set[str] = set()
+        # Postings taken out of the index, compared with the ones that replace
+        # them so a page rendered again only dirties the terms it changed
+        self._removed: dict[int, dict[str, int]] = {}
+        # Hashes of the files on disk
+        self._saved: dict[str, int] = {}
+        # Shards on disk that are not read until a page changes
+        self._unloaded: list[str] = []
+
+    @classmethod
+    def load(cls, directory: str) -> "SearchIndex":
+        index = cls(directory)
+        try:
+            text = read_text(os.path.join(directory, DOCS_NAME))
+            index.docs = json.loads(text)
+            names = os.listdir(directory)
+        except (OSError, ValueError):
+            return cls(directory)
+        index._saved[DOCS_NAME] = hash(text)
+        index._unloaded = [
+            name for name in names if name.endswith(".json") and name != DOCS_NAME
+        ]
+        index._free = [i for i, doc in enumerate(index.docs) if doc is None]
+        return index
+
+    def _load_postings(self) -> None:
+        for name in self._unloaded:
+            text = read_text(os.path.join(self.directory, name))
+            self._saved[name] = hash(text)
+            for term, flat in json.loads(text).items():
+                self.postings[term] = dict(zip(flat[::2], flat[1::2]))
+        self._unloaded = []
+
+    def covers(self, doc_ids: Iterable[int]) -> bool:
+        return all(
+            doc_id < len(self.docs) and self.docs[doc_id] is not None
+            for doc_id in doc_ids
+        )
+
+    def remove(self, doc_ids: Iterable[int]) -> None:
+        doc_ids = [doc_id for doc_id in doc_ids if doc_id < len(self.docs)]
+        if not doc_ids:
+            return
+        self._load_postings()
+        for doc_id in doc_ids:
+            if self.docs[doc_id] is not None:
+                self.docs[doc_id] = None
+                self._free.append(doc_id)
+        removed = {doc_id: self._removed.setdefault(doc_id, {}) for doc_id in doc_ids}
+        empty = []
+        for term, postings in self.postings.items():
+            for doc_id in doc_ids:
+                count = postings.pop(doc_id, None)
+                if count is not None:
+                    removed[doc_id][term] = count
+            if not postings:
+                empty.append(term)
+        for term in empty:
+            del self.postings[term]
+
+    def add(self, url: str, entry: SearchEntry, doc_id: int | None = None) -> int:
+        self._load_postings()
+        # A page keeps its previous id when it is free, so its shards only
+        # change where its terms did
+        if doc_id is not None and doc_id in self._free:
+            self._free.remove(doc_id)
+        elif self._free:
+            doc_id = self._free.pop()
+        else:
+            doc_id = len(self.docs)
+            self.docs.append(None)
+        self.docs[doc_id] = [url, entry.title]
+        for term, count in entry.terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                self.postings[term] = {doc_id: count}
+            else:
+                postings[doc_id] = count
+        old = self._removed.pop(doc_id, None)
+        if old is None:
+            self._dirty.update(entry.terms)
+        else:
+            for term, count in entry.terms.items():
+                if old.pop(term, 0) != count:
+                    self._dirty.add(term)
+            self._dirty.update(old)
+        return doc_id
+
+    def save(self) -> int:
+        os.makedirs(self.directory, exist_ok=True)
+        for terms in self._removed.values():
+            self._dirty.update(terms)
+        # A shard is named after the prefix its terms share
+        prefixes = {term[:SHARD_PREFIX_LENGTH] for term in self._dirty}
+        shards: dict[str, dict[str, list[int]]] = {
+            shard_name(prefix): {} for prefix in prefixes
+        }
+        terms = sorted(
+            term for term in self.postings if term[:SHARD_PREFIX_LENGTH] in prefixes
+        )
+        for term in terms:
+            postings = sorted(self.postings[term].items())
+            shards[shard_name(term)][term] = list(chain.from_iterable(postings))
+        files = {f"{name}.json": terms for name, terms in shards.items()}
+        files[DOCS_NAME] = self.docs
+        written = 0
+        for name, value in files.items():
+            path = os.path.join(self.directory, name)
+            if not value:
+                if self._saved.pop(name, None) is not None:
+                    os.remove(path)
+                continue
+            text = json.dumps(value, separators=(",", ":"))
+            if self._saved.get(name) != hash(text):
+                write_chunks(path, [text])
+                self._saved[name] = hash(text)
+                written += 1
+        # An index rebuilt from scratch replaces the shards of an older one
+        for entry in os.scandir(self.directory):
+            name = entry.name
+            if name.endswith(".json") and name not in self._saved:
+                if name not in self._unloaded:
+                    os.remove(entry.path)
+        self._dirty.clear()
+        self._removed.clear()
+        return written
+
+    def size(self) -> int:
+        return sum(
+            entry.stat().st_size
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".json")
+        )
+
+    def __repr__(self) -> str:
+        pages = len(self.docs) - len(self._free)
+        return f"SearchIndex({self.directory!r}, {pages} pages)"
+
+
+def remove_index(directory: str) -> None:
+    if os.path.isdir(directory):
+        print(f"Removing stale search index {directory}")
+        shutil.rmtree(directory)
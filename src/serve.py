@@ -0,0 +1,144 @@
+import functools
+import os
+import stat
+import threading
+from collections.abc import Iterable
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from src.walk import ignore_matcher
+
+RELOAD_PATH = "/__livereload"
+RELOAD_TIMEOUT = 25.0
+RELOAD_SCRIPT = """<script>
+(async () => {
+  const version = %d;
+  for (;;) {
+    try {
+      const response = await fetch("%s?version=" + version);
+      if (Number(await response.text()) !== version) return location.reload();
+    } catch (error) {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+    }
+  }
+})();
+</script>"""
+
+
+class Watcher:
+    def __init__(self, paths: list[str], ignore: Iterable[str] = ()) -> None:
+        self.paths = paths
+        self.ignored = ignore_matcher(ignore)
+        self.stamps: dict[str, tuple[int, int]] = {}
+        self.directories: dict[str, tuple[int, list[str]]] = {}
+        self.poll()
+
+    def poll(self) -> set[str]:
+        stamps: dict[str, tuple[int, int]] = {}
+        directories: dict[str, tuple[int, list[str]]] = {}
+        pending = list(self.paths)
+        while pending:
+            path = pending.pop()
+            try:
+                info = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if not stat.S_ISDIR(info.st_mode):
+                stamps[path] = (info.st_mtime_ns, info.st_size)
+                continue
+            # A directory's mtime only moves when entries are added, removed or
+            # renamed, so unchanged directories reuse their previous listing
+            previous = directories.get(path) or self.directories.get(path)
+            if previous is not None and previous[0] == info.st_mtime_ns:
+                children = previous[1]
+            else:
+                with os.scandir(path) as entries:
+                    children = [
+                        entry.path for entry in entries if not self.ignored(entry.name)
+                    ]
+            directories[path] = (info.st_mtime_ns, children)
+            pending.extend(children)
+
+        changed = {
+            path
+            for path in stamps.keys() | self.stamps.keys()
+            if stamps.get(path) != self.stamps.get(path)
+        }
+        self.stamps = stamps
+        self.directories = directories
+        return changed
+
+
+class LiveReload:
+    def __init__(self) -> None:
+        self.version = 0
+        self._condition = threading.Condition()
+
+    def notify(self) -> None:
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+
+    def wait(self, version: int, timeout: float = RELOAD_TIMEOUT) -> int:
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    def __init__(
+        self, *args, reload: LiveReload, basepath: str = "/", **kwargs
+    ) -> None:
+        self.reload = reload
+        self.basepath = basepath
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        path, _, query = self.path.partition("?")
+        if path == RELOAD_PATH:
+            version = query.removeprefix("version=")
+            self.send_text(str(self.reload.wait(int(version or -1))))
+            return
+
+        file = self.translate_path(path)
+        if path.endswith("/"):
+            file = os.path.join(file, "index.html")
+        if not file.endswith(".html") or not os.path.isfile(file):
+            super().do_GET()
+            return
+
+        with open(file) as html:
+            contents = html.read()
+        script = RELOAD_SCRIPT % (self.reload.version, RELOAD_PATH)
+        head, body, tail = contents.rpartition("</body>")
+        contents = head + script + body + tail if body else contents + script
+        self.send_text(contents, "text/html")
+
+    def send_text(self, text: str, content_type: str = "text/plain") -> None:
+        data = text.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def translate_path(self, path: str) -> str:
+        if path.startswith(self.basepath):
+            path = "/" + path.removeprefix(self.basepath)
+        return super().translate_path(path)
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.path.startswith(RELOAD_PATH):
+            super().log_message(format, *args)
+
+
+def start_server(
+    directory: str, port: int, basepath: str, reload: LiveReload
+) -> ThreadingHTTPServer:
+    handler = functools.partial(
+        PreviewHandler, directory=directory, reload=reload, basepath=basepath
+    )
+    server = ThreadingHTTPServer(("localhost", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,138 @@
+import json
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+
+from src.htmlnode import HTMLNode
+
+_END = object()
+
+
+class BuildStats:
+    enabled = True
+
+    def __init__(self) -> None:
+        self.stages: dict[str, dict[str, float]] = {}
+        self.counters: dict[str, int] = {}
+        self.pages: dict[str, dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add_time(
+                name, time.perf_counter() - wall, time.process_time() - cpu
+            )
+
+    def timed(self, name: str, items: Iterable) -> Iterator:
+        # Adds the time spent producing each item to the stage, not the time
+        # its consumer spends on it
+        items = iter(items)
+        while True:
+            wall, cpu = time.perf_counter(), time.process_time()
+            item = next(items, _END)
+            self.add_time(
+                name, time.perf_counter() - wall, time.process_time() - cpu, 0
+            )
+            if item is _END:
+                return
+            yield item
+
+    def add_time(self, name: str, wall: float, cpu: float, calls: int = 1) -> None:
+        timing = self.stages.setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+        timing["wall"] += wall
+        timing["cpu"] += cpu
+        timing["calls"] += calls
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_page(self, page: str, **values: float) -> None:
+        self.pages[page] = values
+
+    def merge(self, other: "BuildStats") -> None:
+        for name, timing in other.stages.items():
+            self.add_time(name, timing["wall"], timing["cpu"], timing["calls"])
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+        self.pages.update(other.pages)
+
+    def slowest_pages(self, limit: int) -> list[tuple[str, dict[str, float]]]:
+        pages = sorted(self.pages.items(), key=lambda item: (-item[1]["wall"], item[0]))
+        return pages[:limit]
+
+    def to_dict(self, slowest: int = 10) -> dict:
+        return {
+            "stages": self.stages,
+            "counters": self.counters,
+            "pages": self.pages,
+            "slowest": [page for page, _ in self.slowest_pages(slowest)],
+        }
+
+    def save(self, path: str, slowest: int = 10) -> None:
+        with open(path, "w") as file:
+            json.dump(self.to_dict(slowest), file, indent=2, sort_keys=True)
+
+    def summary(self, slowest: int = 10) -> str:
+        lines = ["Stage                wall (s)   cpu (s)    calls"]
+        for name, timing in self.stages.items():
+            lines.append(
+                f"{name:<18} {timing['wall']:10.3f} {timing['cpu']:9.3f} "
+                f"{timing['calls']:8d}"
+            )
+        lines.append("")
+        lines.extend(f"{name}: {amount}" for name, amount in self.counters.items())
+        if self.pages:
+            lines.append("")
+            lines.append(f"Slowest {min(slowest, len(self.pages))} pages:")
+            for page, values in self.slowest_pages(slowest):
+                lines.append(
+                    f"  {values['wall'] * 1000:8.2f} ms  {page} "
+                    f"({values['nodes']} nodes, {values['output_bytes']} bytes)"
+                )
+        return "\n".join(lines)
+
+
+class NullStats(BuildStats):
+    enabled = False
+
+    def stage(self, name: str):
+        return nullcontext()
+
+    def timed(self, name: str, items: Iterable) -> Iterator:
+        return iter(items)
+
+    def add_time(self, name: str, wall: float, cpu: float, calls: int = 1) -> None:
+        pass
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+    def add_page(self, page: str, **values: float) -> None:
+        pass
+
+
+def count_nodes(node: HTMLNode) -> int:
+    total = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        total += 1
+        if node.children is not None:
+            stack.extend(node.children)
+    return total
+
+
+class ByteCounter:
+    __slots__ = ("chunks", "size")
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self.chunks = chunks
+        self.size = 0
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self.chunks:
+            self.size += len(chunk.encode())
+            yield chunk
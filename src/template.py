@@ -0,0 +1,124 @@
+import copy
+import os
+import re
+from collections.abc import Iterator
+from typing import TextIO
+
+from src.htmlnode import HTMLNode
+from src.minify import minify_parts
+from src.urls import UrlResolver
+
+TAG_PATTERN = re.compile(r"\{\{\s*([<>]?)\s*([^{}]*?)\s*\}\}")
+LAYOUT_SLOT_PATTERN = re.compile(r"\{\{\s*Body\s*\}\}")
+
+_cache: dict[str, tuple[tuple | None, "Template"]] = {}
+
+
+class Template:
+    def __init__(self, source: str, directory: str = ".") -> None:
+        self.files: list[str] = []
+        self.source = self._expand(source, directory, ())
+        self._parts: list[str] = []
+        self._slots: dict[int, str] = {}
+        self.minified = False
+        self._compile()
+
+    def render(self, **values: str | HTMLNode) -> str:
+        return "".join(self.iter_render(**values))
+
+    def iter_render(self, **values: str | HTMLNode) -> Iterator[str]:
+        for index, part in enumerate(self._parts):
+            name = self._slots.get(index)
+            value = part if name is None else values.get(name, part)
+            if isinstance(value, HTMLNode):
+                yield from value.iter_html(self.minified)
+            else:
+                yield value
+
+    def write_to(self, file: TextIO, **values: str | HTMLNode) -> None:
+        file.writelines(self.iter_render(**values))
+
+    def resolve_urls(self, resolver: UrlResolver) -> "Template":
+        resolved = copy.copy(self)
+        resolved._parts = [
+            part if index in self._slots else resolver.resolve_attributes(part)
+            for index, part in enumerate(self._parts)
+        ]
+        return resolved
+
+    def minify(self) -> "Template":
+        minified = copy.copy(self)
+        minified._parts = minify_parts(self._parts, self._slots)
+        minified.minified = True
+        return minified
+
+    @property
+    def slots(self) -> list[str]:
+        return list(self._slots.values())
+
+    def _expand(self, source: str, directory: str, seen: tuple[str, ...]) -> str:
+        layout = None
+        expanded = []
+        position = 0
+        for match in TAG_PATTERN.finditer(source):
+            kind, name = match.groups()
+            if not kind:
+                continue
+            expanded.append(source[position : match.start()])
+            position = match.end()
+            path = os.path.normpath(os.path.join(directory, name))
+            if path in seen:
+                raise ValueError(f"Template {path} includes itself")
+            if kind == "<":
+                layout = path
+                continue
+            expanded.append(self._read(path, seen))
+        expanded.append(source[position:])
+        source = "".join(expanded)
+
+        if layout is None:
+            return source
+        return LAYOUT_SLOT_PATTERN.sub(lambda _: source, self._read(layout, seen))
+
+    def _read(self, path: str, seen: tuple[str, ...]) -> str:
+        with open(path) as file:
+            contents = file.read()
+        self.files.append(path)
+        return self._expand(contents, os.path.dirname(path), (*seen, path))
+
+    def _compile(self) -> None:
+        position = 0
+        for match in TAG_PATTERN.finditer(self.source):
+            literal = self.source[position : match.start()]
+            if literal:
+                self._parts.append(literal)
+            self._slots[len(self._parts)] = match[2]
+            self._parts.append(match[0])
+            position = match.end()
+        if position < len(self.source):
+            self._parts.append(self.source[position:])
+
+    def __eq__(self, value: object, /) -> bool:
+        return isinstance(value, Template) and self.source == value.source
+
+    def __repr__(self) -> str:
+        return f"Template({self.source!r}, {self.slots})"
+
+
+def load_template(path: str) -> Template:
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == _stamps(cached[1].files):
+        return cached[1]
+
+    with open(path) as file:
+        template = Template(file.read(), os.path.dirname(path))
+    template.files.insert(0, path)
+    _cache[path] = (_stamps(template.files), template)
+    return template
+
+
+def _stamps(files: list[str]) -> tuple | None:
+    try:
+        return tuple(os.stat(file).st_mtime_ns for file in files)
+    except FileNotFoundError:
+        return None
@@ -2,11 +2,14 @@ import re
 from enum import StrEnum
 
 from src.htmlnode import LeafNode
+from src.urls import UrlResolver
 
 TextType = StrEnum("TextType", ["TEXT", "BOLD", "ITALIC", "CODE", "LINK", "IMAGE"])
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(
         self, text: str, text_type: TextType = TextType.TEXT, url: str | None = None
     ) -> None:
@@ -14,7 +17,7 @@ class TextNode:
         self.text_type = text_type
         self.url = url
 
-    def to_html_node(self) -> LeafNode:
+    def to_html_node(self, resolver: UrlResolver | None = None) -> LeafNode:
         match self.text_type:
             case TextType.TEXT:
                 return LeafNode(None, self.text)
@@ -25,9 +28,17 @@ class TextNode:
             case TextType.CODE:
                 return LeafNode("code", self.text)
             case TextType.LINK:
-                return LeafNode("a", self.text, {"href": self.url})
+                return LeafNode("a", self.text, {"href": self._resolve(resolver)})
             case TextType.IMAGE:
-                return LeafNode("img", "", {"src": self.url, "alt": self.text})
+                props = {"src": self._resolve(resolver), "alt": self.text}
+                if resolver is not None and self.url is not None:
+                    props.update(resolver.image_attributes(self.url))
+                return LeafNode("img", "", props)
+
+    def _resolve(self, resolver: UrlResolver | None) -> str | None:
+        if resolver is None or self.url is None:
+            return self.url
+        return resolver.resolve(self.url)
 
     def extract_markdown_images(self) -> list[tuple]:
         pat = r"!\[(.*?)]\((.*?)\)"
@@ -0,0 +1,73 @@
+import json
+import re
+
+from src.manifest import hash_bytes
+
+URL_ATTRIBUTE_PATTERN = re.compile(r'\b(href|src)="([^"]*)"')
+URL_SUFFIX_PATTERN = re.compile(r"[?#]")
+
+
+class UrlResolver:
+    def __init__(
+        self,
+        basepath: str = "/",
+        assets: dict[str, str] | None = None,
+        images: dict[str, tuple[int, int]] | None = None,
+    ) -> None:
+        self.basepath = basepath
+        # Maps asset paths, relative to the site root, to fingerprinted names
+        self.assets = assets or {}
+        # Maps image paths to their dimensions, None leaves images untouched
+        self.images = images
+        self._key = f"basepath={basepath}"
+        if self.assets:
+            self._key += f",assets={_hash_json(self.assets)}"
+        if images is not None:
+            self._key += f",images={_hash_json(images)}"
+
+    @property
+    def key(self) -> str:
+        # Identifies everything that affects resolved URLs, for cache keys
+        return self._key
+
+    def resolve(self, url: str) -> str:
+        if not url.startswith("/") or url.startswith("//"):
+            return url
+        path = url[1:]
+        if self.assets:
+            path, suffix = _split_suffix(path)
+            path = self.assets.get(path, path) + suffix
+        return self.basepath + path
+
+    def image_attributes(self, url: str) -> dict[str, str]:
+        if self.images is None:
+            return {}
+        attributes = {"loading": "lazy", "decoding": "async"}
+        if url.startswith("/") and not url.startswith("//"):
+            size = self.images.get(_split_suffix(url[1:])[0])
+            if size is not None:
+                width, height = size
+                attributes = {"width": str(width), "height": str(height), **attributes}
+        return attributes
+
+    def resolve_attributes(self, html: str) -> str:
+        return URL_ATTRIBUTE_PATTERN.sub(
+            lambda match: f'{match[1]}="{self.resolve(match[2])}"', html
+        )
+
+    def __eq__(self, value: object, /) -> bool:
+        return isinstance(value, UrlResolver) and self.key == value.key
+
+    def __repr__(self) -> str:
+        return f"UrlResolver({self.basepath!r}, {len(self.assets)} assets)"
+
+
+def _split_suffix(path: str) -> tuple[str, str]:
+    suffix = URL_SUFFIX_PATTERN.search(path)
+    if suffix is None:
+        return path, ""
+    return path[: suffix.start()], path[suffix.start() :]
+
+
+def _hash_json(value: dict) -> str:
+    return hash_bytes(json.dumps(value, sort_keys=True).encode())
@@ -0,0 +1,53 @@
+import fnmatch
+import os
+import re
+from collections.abc import Callable, Iterable, Iterator
+
+DEFAULT_IGNORE = (
+    ".git",
+    ".hg",
+    ".svn",
+    ".DS_Store",
+    "_drafts",
+    "*.swp",
+    "*.swo",
+    "*~",
+    ".#*",
+)
+
+
+def ignore_matcher(patterns: Iterable[str]) -> Callable[[str], object]:
+    pattern = "|".join(fnmatch.translate(pattern) for pattern in patterns)
+    if not pattern:
+        return lambda name: None
+    return re.compile(pattern).match
+
+
+def iter_files(root: str, ignore: Iterable[str] = DEFAULT_IGNORE) -> Iterator[str]:
+    if not os.path.isdir(root):
+        return iter(())
+    return _walk(root, "", ignore_matcher(ignore))
+
+
+def _walk(
+    directory: str, prefix: str, ignored: Callable[[str], object]
+) -> Iterator[str]:
+    try:
+        with os.scandir(directory) as entries:
+            # Directories sort as "name/" so the walk yields paths in the same
+            # order as sorting the full list of relative paths would
+            entries = sorted(
+                (entry for entry in entries if not ignored(entry.name)), key=_sort_key
+            )
+    except FileNotFoundError:
+        # Removed while the walk was still running
+        return
+    for entry in entries:
+        if entry.is_dir():
+            yield from _walk(entry.path, f"{prefix}{entry.name}{os.sep}", ignored)
+        elif entry.is_file():
+            yield prefix + entry.name
+
+
+def _sort_key(entry: os.DirEntry) -> str:
+    return entry.name + os.sep if entry.is_dir() else entry.name
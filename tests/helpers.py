@@ -0,0 +1,26 @@
+import os
+import tempfile
+import unittest
+
+
+class TempDirTestCase(unittest.TestCase):
+    # Tests that build a site run from inside the temporary directory
+    chdir = False
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        if self.chdir:
+            self.addCleanup(os.chdir, os.getcwd())
+            os.chdir(self.tmp.name)
+
+    def write(self, path: str, contents: str) -> str:
+        path = os.path.join(self.tmp.name, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(contents)
+        return path
+
+    def read(self, path: str) -> str:
+        with open(os.path.join(self.tmp.name, path)) as file:
+            return file.read()
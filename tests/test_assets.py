@@ -0,0 +1,198 @@
+import contextlib
+import io
+import os
+import unittest
+from unittest import mock
+
+from src.assets import fingerprinted_name, install_file
+from src.main import copy_contents, fingerprint_assets, main
+from src.manifest import MANIFEST_NAME, Manifest, hash_file
+from tests.helpers import TempDirTestCase
+
+
+class TestCopyContents(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.output = os.path.join(self.tmp.name, "public")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.static, "images", "a.png"), "png")
+
+    def sync(self, previous: dict[str, str], **kwargs) -> dict[str, str]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return copy_contents(self.static, self.output, previous, **kwargs)
+
+    def test_copies_only_changed_files(self):
+        assets = self.sync({})
+        self.assertEqual(self.read("public/index.css"), "body {}")
+        copied = os.stat(os.path.join(self.output, "images", "a.png")).st_ino
+
+        self.write(os.path.join(self.static, "index.css"), "main {}")
+        self.sync(assets)
+        self.assertEqual(self.read("public/index.css"), "main {}")
+        self.assertEqual(
+            os.stat(os.path.join(self.output, "images", "a.png")).st_ino, copied
+        )
+
+    def test_removes_stale_files(self):
+        assets = self.sync({})
+        os.remove(os.path.join(self.static, "images", "a.png"))
+        self.assertEqual(self.sync(assets), {"index.css": ""})
+        self.assertFalse(os.path.exists(os.path.join(self.output, "images")))
+
+    def test_checksum_detects_changes_with_same_size_and_mtime(self):
+        path = os.path.join(self.static, "index.css")
+        assets = self.sync({}, checksum=True)
+        stat = os.stat(path)
+        self.write(path, "body []")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.sync(assets)
+        self.assertEqual(self.read("public/index.css"), "body {}")
+        self.sync(assets, checksum=True)
+        self.assertEqual(self.read("public/index.css"), "body []")
+
+    def test_hardlinks_share_the_source_file(self):
+        self.sync({}, link="hardlink")
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(self.static, "index.css"),
+                os.path.join(self.output, "index.css"),
+            )
+        )
+
+    def test_reflink_falls_back_to_copy(self):
+        self.sync({}, link="reflink")
+        self.assertEqual(self.read("public/index.css"), "body {}")
+        self.assertEqual(
+            os.stat(os.path.join(self.static, "index.css")).st_mtime_ns,
+            os.stat(os.path.join(self.output, "index.css")).st_mtime_ns,
+        )
+
+    def test_install_file_replaces_existing_link(self):
+        src = os.path.join(self.static, "index.css")
+        dest = os.path.join(self.output, "index.css")
+        install_file(src, dest, "hardlink")
+        install_file(src, dest, "copy")
+        self.assertFalse(os.path.samefile(src, dest))
+        self.assertEqual(self.read("public/index.css"), "body {}")
+
+
+class TestFingerprintAssets(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.output = os.path.join(self.tmp.name, "public")
+        self.write("static/index.css", "body {}")
+        self.write("static/a.png", "png")
+
+    def fingerprint(
+        self, previous: dict[str, list], link: str = "copy"
+    ) -> dict[str, list]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            assets = copy_contents(self.static, self.output, link=link)
+            return fingerprint_assets(self.output, assets, previous)
+
+    def test_fingerprinted_name(self):
+        self.assertEqual(
+            fingerprinted_name("css/index.css", "3f9a1c2b0d"), "css/index.3f9a1c2b.css"
+        )
+        self.assertEqual(
+            fingerprinted_name("LICENSE", "3f9a1c2b0d"), "LICENSE.3f9a1c2b"
+        )
+
+    def test_fingerprinted_copy_links_the_asset(self):
+        fingerprints = self.fingerprint({})
+        _, name = fingerprints["index.css"]
+        self.assertRegex(name, r"^index\.[0-9a-f]{8}\.css$")
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(self.output, name),
+                os.path.join(self.output, "index.css"),
+            )
+        )
+
+    def test_unchanged_assets_are_not_hashed_again(self):
+        previous = self.fingerprint({})
+        with mock.patch("src.main.hash_file") as hash_file:
+            self.assertEqual(self.fingerprint(previous), previous)
+        hash_file.assert_not_called()
+
+    def test_checksum_digests_are_reused(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            assets = copy_contents(self.static, self.output, checksum=True)
+        with mock.patch("src.main.hash_file") as hash_file:
+            fingerprints = fingerprint_assets(self.output, assets)
+        hash_file.assert_not_called()
+        self.assertEqual(
+            fingerprints["index.css"],
+            [assets["index.css"], fingerprinted_name("index.css", assets["index.css"])],
+        )
+
+    def test_changed_asset_replaces_its_fingerprint(self):
+        previous = self.fingerprint({})
+        self.write("static/index.css", "main {}")
+        fingerprints = self.fingerprint(previous)
+        self.assertNotEqual(fingerprints["index.css"], previous["index.css"])
+        self.assertEqual(fingerprints["a.png"], previous["a.png"])
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output, previous["index.css"][1]))
+        )
+        self.assertEqual(
+            self.read(os.path.join("public", fingerprints["index.css"][1])), "main {}"
+        )
+
+    def test_hardlinked_asset_edited_in_place(self):
+        previous = self.fingerprint({}, "hardlink")
+        # Editing in place keeps the inode the output and its fingerprint share
+        self.write("static/index.css", "main { color: red }")
+        fingerprints = self.fingerprint(previous, "hardlink")
+        _, name = fingerprints["index.css"]
+        self.assertNotEqual(name, previous["index.css"][1])
+        digest = hash_file(os.path.join(self.static, "index.css"))
+        self.assertEqual(name, fingerprinted_name("index.css", digest))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output, previous["index.css"][1]))
+        )
+
+
+class TestIncrementalAssets(TempDirTestCase):
+    chdir = True
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.write("template.html", "{{ Content }}")
+        self.write("static/index.css", "body {}")
+        self.write("content/index.md", "# Home")
+
+    def test_assets_are_tracked_in_the_manifest(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            main("/", "public", incremental=True)
+            os.remove("static/index.css")
+            main("/", "public", incremental=True)
+        manifest = Manifest.load(os.path.join("public", MANIFEST_NAME))
+        self.assertEqual(manifest.assets, {})
+        self.assertEqual(set(manifest.pages), {"index.md"})
+        self.assertFalse(os.path.exists("public/index.css"))
+
+    def test_fingerprinted_references_are_rewritten(self):
+        self.write("template.html", '<link href="/index.css">{{ Content }}')
+        self.write("content/index.md", "# Home\n\n![style](/index.css?v=1#top)")
+        with contextlib.redirect_stdout(io.StringIO()):
+            main("/site/", "public", incremental=True, fingerprint=True)
+        manifest = Manifest.load(os.path.join("public", MANIFEST_NAME))
+        _, name = manifest.fingerprints["index.css"]
+        html = self.read("public/index.html")
+        self.assertIn(f'<link href="/site/{name}">', html)
+        self.assertIn(f'src="/site/{name}?v=1#top"', html)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            main("/site/", "public", incremental=True)
+        manifest = Manifest.load(os.path.join("public", MANIFEST_NAME))
+        self.assertEqual(manifest.fingerprints, {})
+        self.assertFalse(os.path.exists(os.path.join("public", name)))
+        self.assertIn('<link href="/site/index.css">', self.read("public/index.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src.atomic import generations_directory
+from src.main import BuildError, main, rebuild
+from tests.helpers import TempDirTestCase
+
+
+def page(title: str) -> str:
+    return f"<h1>{title}</h1><div><h1>{title}</h1></div>"
+
+
+class TestAtomicBuild(TempDirTestCase):
+    chdir = True
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.write("template.html", "<h1>{{ Title }}</h1>{{ Content }}")
+        self.write("static/index.css", "body {}")
+        self.write("content/index.md", "# Home")
+        self.write("content/blog/post.md", "# Post")
+
+    def build(self) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            main("/", "public", atomic=True)
+
+    def generations(self) -> list[str]:
+        return sorted(os.listdir(generations_directory("public")))
+
+    def test_output_is_swapped_in_as_a_symlink(self):
+        self.build()
+        self.assertTrue(os.path.islink("public"))
+        self.assertEqual(self.read("public/index.html"), page("Home"))
+        self.assertEqual(self.read("public/index.css"), "body {}")
+
+    def test_unchanged_files_are_hardlinked(self):
+        self.build()
+        previous = os.path.realpath("public")
+        self.write("content/index.md", "# Changed")
+        self.build()
+        self.assertNotEqual(os.path.realpath("public"), previous)
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(previous, "blog", "post.html"), "public/blog/post.html"
+            )
+        )
+        self.assertEqual(self.read(os.path.join(previous, "index.html")), page("Home"))
+        self.assertEqual(self.read("public/index.html"), page("Changed"))
+
+    def test_failed_build_keeps_previous_site(self):
+        self.build()
+        live = os.path.realpath("public")
+        self.write("content/index.md", "No title")
+        with self.assertRaises(BuildError):
+            self.build()
+        self.assertEqual(os.path.realpath("public"), live)
+        self.assertEqual(self.read("public/index.html"), page("Home"))
+        self.assertEqual(self.generations(), [os.path.basename(live)])
+
+    def test_watch_rebuilds_are_swapped_in(self):
+        self.build()
+        live = os.path.realpath("public")
+        self.write("content/index.md", "# Changed")
+        with contextlib.redirect_stdout(io.StringIO()):
+            rebuild({"./content/index.md"}, "/", "public", atomic=True)
+        self.assertNotEqual(os.path.realpath("public"), live)
+        self.assertEqual(self.read(os.path.join(live, "index.html")), page("Home"))
+        self.assertEqual(self.read("public/index.html"), page("Changed"))
+
+        self.write("content/index.md", "No title")
+        with self.assertRaises(BuildError):
+            with contextlib.redirect_stdout(io.StringIO()):
+                rebuild({"./content/index.md"}, "/", "public", atomic=True)
+        self.assertEqual(self.read("public/index.html"), page("Changed"))
+        self.assertEqual(len(self.generations()), 2)
+
+    def test_old_generations_are_pruned(self):
+        for _ in range(4):
+            self.build()
+        self.assertEqual(len(self.generations()), 2)
+        self.assertIn(os.path.basename(os.path.realpath("public")), self.generations())
+
+    def test_plain_directory_is_migrated(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            main("/", "public")
+        self.build()
+        self.assertTrue(os.path.islink("public"))
+        self.assertEqual(self.read("public/blog/post.html"), page("Post"))
+
+    def test_plain_build_replaces_symlink(self):
+        self.build()
+        with contextlib.redirect_stdout(io.StringIO()):
+            main("/", "public")
+        self.assertFalse(os.path.islink("public"))
+        self.assertEqual(self.read("public/index.html"), page("Home"))
+
+
+if __name__ == "__main__":
+    unittest.main()
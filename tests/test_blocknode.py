@@ -100,6 +100,50 @@ class TestBlockNode(unittest.TestCase):
         html = block.to_html_node().to_html()
         self.assertEqual(html, "<p>This is a very <b>bold</b> message</p>")
 
+    def test_normalization(self):
+        block = BlockNode("\n   first line\n\n  \n\tsecond line  \n")
+        self.assertEqual(block.block, "first line\nsecond line  ")
+        self.assertEqual(block.lines, ["first line", "second line  "])
+
+    def test_long_quote_block(self):
+        block = BlockNode("\n".join(f"> line {i}" for i in range(20)))
+        html = block.to_html_node().to_html()
+        self.assertEqual(block.block_type, BlockType.QUOTE)
+        self.assertEqual(
+            html,
+            "<blockquote>"
+            + "\n".join(f"line {i}" for i in range(20))
+            + "</blockquote>",
+        )
+
+    def test_quote_keeps_inner_markers(self):
+        block = BlockNode("> a > b\n>\n> c")
+        html = block.to_html_node().to_html()
+        self.assertEqual(html, "<blockquote>a &gt; b\nc</blockquote>")
+
+    def test_list_items_keep_inner_markers(self):
+        unordered = BlockNode("- Tolkien - the author\n- a-b")
+        ordered = BlockNode("1. Version 2. thing\n2. Done. Really")
+        self.assertEqual(
+            unordered.to_html_node().to_html(),
+            "<ul><li>Tolkien - the author</li><li>a-b</li></ul>",
+        )
+        self.assertEqual(
+            ordered.to_html_node().to_html(),
+            "<ol><li>Version 2. thing</li><li>Done. Really</li></ol>",
+        )
+
+    def test_long_ordered_list(self):
+        block = BlockNode("\n".join(f"{i}. item" for i in range(1, 13)))
+        html = block.to_html_node().to_html()
+        self.assertEqual(block.block_type, BlockType.ORDERED_LIST)
+        self.assertEqual(html, "<ol>" + "<li>item</li>" * 12 + "</ol>")
+
+    def test_heading_requires_whitespace(self):
+        self.assertEqual(BlockNode("##").block_type, BlockType.PARAGRAPH)
+        self.assertEqual(BlockNode("####### x").block_type, BlockType.PARAGRAPH)
+        self.assertEqual(BlockNode("###### x").block_type, BlockType.HEADING)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest import mock
+
+from src.cache import LRUCache
+from src.htmlnode import RawNode
+from src.markdown_blocks import markdown_to_html
+
+FOOTER = "Written by **Gepsu**, see [the repo](https://github.com/Gepsu)"
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", "1")
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual(cache.get("c"), "3")
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(0)
+        cache.put("a", "1")
+        self.assertEqual(len(cache), 0)
+
+    def test_resize(self):
+        cache = LRUCache(3)
+        for key in "abc":
+            cache.put(key, key)
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get("c"), "c")
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_cached_output_matches_uncached(self):
+        cache = LRUCache()
+        md = f"# Title\n\n{FOOTER}\n\n```\ncode\n```\n\n- a\n- b"
+        expected = markdown_to_html(md, cache=None).to_html()
+        self.assertEqual(markdown_to_html(md, cache).to_html(), expected)
+        self.assertEqual(markdown_to_html(md, cache).to_html(), expected)
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+    def test_repeated_blocks_skip_inline_parsing(self):
+        cache = LRUCache()
+        markdown_to_html(f"# First\n\n{FOOTER}", cache)
+        with mock.patch("src.blocknode.to_textnodes") as to_textnodes:
+            html = markdown_to_html(f"# First\n\n{FOOTER}", cache)
+        to_textnodes.assert_not_called()
+        self.assertIsInstance(html.children[1], RawNode)
+        self.assertIn("<b>Gepsu</b>", html.to_html())
+
+
+class TestRawNode(unittest.TestCase):
+    def test_to_html(self):
+        self.assertEqual(RawNode("<p>hi</p>").to_html(), "<p>hi</p>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import contextlib
+import gzip
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.compress import gzip_file, is_compressible
+from src.main import compress_output
+from src.stats import BuildStats
+from tests.helpers import TempDirTestCase
+
+PAGE = "<p>" + "The ring of power was forged in the fires of mount doom. " * 40
+
+
+class TestGzipFile(unittest.TestCase):
+    def test_is_compressible(self):
+        self.assertTrue(is_compressible("index.html", 2048, 1024))
+        self.assertTrue(is_compressible("css/site.css", 1024, 1024))
+        self.assertFalse(is_compressible("index.html", 1023, 1024))
+        self.assertFalse(is_compressible("images/tree.png", 4096, 1024))
+
+    def test_round_trip_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            with open(path, "w") as file:
+                file.write(PAGE)
+            sizes = gzip_file(path)
+            with open(f"{path}.gz", "rb") as file:
+                first = file.read()
+            gzip_file(path)
+            with open(f"{path}.gz", "rb") as file:
+                second = file.read()
+        self.assertEqual(first, second)
+        self.assertEqual(gzip.decompress(first).decode(), PAGE)
+        self.assertEqual(sizes, (len(PAGE), len(first)))
+
+
+class TestCompressOutput(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.dest = self.tmp.name
+        self.write("index.html", PAGE)
+        self.write("blog/post.html", PAGE + "<p>post</p>")
+        self.write("index.css", "body { color: red; }\n" * 100)
+        self.write("small.html", "<p>small</p>")
+        self.write("images/tree.png", "x" * 4096)
+
+    def compress(self, previous: dict[str, str]) -> tuple[dict[str, str], BuildStats]:
+        stats = BuildStats()
+        with contextlib.redirect_stdout(io.StringIO()):
+            compressed = compress_output(self.dest, previous, 1024, stats)
+        return compressed, stats
+
+    def sidecars(self) -> list[str]:
+        return sorted(
+            os.path.relpath(os.path.join(directory, name), self.dest)
+            for directory, _, names in os.walk(self.dest)
+            for name in names
+            if name.endswith(".gz")
+        )
+
+    def test_compresses_large_html_and_css(self):
+        compressed, stats = self.compress({})
+        post = os.path.join("blog", "post.html")
+        self.assertEqual(sorted(compressed), [post, "index.css", "index.html"])
+        self.assertEqual(self.sidecars(), [f"{item}.gz" for item in sorted(compressed)])
+        self.assertEqual(stats.counters["gzip_files"], 3)
+        self.assertLess(
+            stats.counters["gzip_output_bytes"], stats.counters["gzip_input_bytes"] / 4
+        )
+
+    def test_unchanged_files_are_skipped(self):
+        previous, _ = self.compress({})
+        self.write("index.html", PAGE + "<p>changed</p>")
+        with mock.patch("src.compress.gzip_file", wraps=gzip_file) as compress:
+            compressed, stats = self.compress(previous)
+        compress.assert_called_once_with(os.path.join(self.dest, "index.html"))
+        self.assertEqual(stats.counters["gzip_skipped"], 2)
+        self.assertNotEqual(compressed["index.html"], previous["index.html"])
+        with open(os.path.join(self.dest, "index.html.gz"), "rb") as file:
+            self.assertTrue(gzip.decompress(file.read()).endswith(b"changed</p>"))
+
+    def test_stale_sidecars_are_removed(self):
+        previous, _ = self.compress({})
+        os.remove(os.path.join(self.dest, "blog", "post.html"))
+        self.write("index.css", "body { color: red; }\n")
+        compressed, _ = self.compress(previous)
+        self.assertEqual(sorted(compressed), ["index.html"])
+        self.assertEqual(self.sidecars(), ["index.html.gz"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog")))
+
+
+if __name__ == "__main__":
+    unittest.main()
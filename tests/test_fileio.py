@@ -0,0 +1,142 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from src.fileio import IOPool, read_text, write_chunks
+from src.main import BuildError, generate_pages
+from src.manifest import MANIFEST_NAME, Manifest
+from src.stats import BuildStats
+from tests.helpers import TempDirTestCase
+
+
+class TestIOPool(unittest.TestCase):
+    def test_prefetch_and_take(self):
+        with IOPool(2) as pool:
+            pool.prefetch("a", str.upper, "a")
+            pool.prefetch("b", str.upper, "b")
+            self.assertEqual(pool.take("b"), "B")
+            self.assertEqual(pool.take("a"), "A")
+
+    def test_take_raises_read_errors(self):
+        with IOPool(1) as pool:
+            pool.prefetch("missing", read_text, "/nonexistent/file.md")
+            with self.assertRaises(FileNotFoundError):
+                pool.take("missing")
+
+    def test_close_reports_failed_writes(self):
+        def fail(path: str) -> None:
+            raise OSError(f"cannot write {path}")
+
+        pool = IOPool(2)
+        pool.write("ok", len, "ok")
+        pool.write("bad", fail, "bad")
+        failures = pool.close()
+        self.assertEqual([path for path, _ in failures], ["bad"])
+        self.assertIsInstance(failures[0][1], OSError)
+        self.assertEqual(pool.close(), failures)
+
+    def test_peak_is_bounded_by_threads(self):
+        barrier = threading.Barrier(3)
+
+        def wait() -> None:
+            # Blocks until three operations run at the same time
+            barrier.wait(timeout=5)
+
+        with IOPool(3) as pool:
+            for i in range(9):
+                pool.write(str(i), wait)
+            self.assertEqual(pool.close(), [])
+        self.assertEqual(pool.peak, 3)
+
+
+class TestWriteChunks(unittest.TestCase):
+    def test_failed_open_keeps_its_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = os.path.join(tmp, "index.html")
+            with mock.patch("builtins.open", side_effect=PermissionError("denied")):
+                with self.assertRaises(PermissionError):
+                    write_chunks(dest, ["<p>x</p>"])
+
+    def test_failed_write_removes_the_temporary_file(self):
+        def chunks():
+            yield "<p>"
+            raise OSError("disk full")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = os.path.join(tmp, "index.html")
+            with self.assertRaisesRegex(OSError, "disk full"):
+                write_chunks(dest, chunks())
+            self.assertEqual(os.listdir(tmp), [])
+
+
+class TestPipelinedBuild(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = self.write(
+            "template.html", "<title>{{ Title }}</title>{{ Content }}"
+        )
+        for i in range(20):
+            page = os.path.join("content", f"section{i % 3}", f"page{i}.md")
+            self.write(page, f"# Page {i}\n\nText of page {i}")
+
+    def build(self, output: str, io_threads: int) -> tuple[str, BuildStats]:
+        stats = BuildStats()
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            generate_pages(
+                self.content,
+                output,
+                self.template,
+                "/",
+                stats=stats,
+                io_threads=io_threads,
+            )
+        return log.getvalue(), stats
+
+    def read_output(self, output: str) -> dict[str, str]:
+        pages = {}
+        for directory, _, names in os.walk(output):
+            for name in names:
+                if name != MANIFEST_NAME:
+                    path = os.path.join(directory, name)
+                    pages[os.path.relpath(path, output)] = read_text(path)
+        return pages
+
+    def test_output_matches_blocking_io(self):
+        serial = os.path.join(self.tmp.name, "serial")
+        threaded = os.path.join(self.tmp.name, "threaded")
+        serial_log, serial_stats = self.build(serial, 0)
+        threaded_log, threaded_stats = self.build(threaded, 4)
+        self.assertEqual(self.read_output(serial), self.read_output(threaded))
+        self.assertEqual(
+            serial_log.replace(serial, "OUT"), threaded_log.replace(threaded, "OUT")
+        )
+        self.assertNotIn("io_peak_in_flight", serial_stats.counters)
+        self.assertIn(threaded_stats.counters["io_peak_in_flight"], range(1, 5))
+        self.assertEqual(
+            serial_stats.counters["output_bytes"],
+            threaded_stats.counters["output_bytes"],
+        )
+
+    def test_failed_write_fails_its_page(self):
+        output = os.path.join(self.tmp.name, "public")
+        # A directory in place of the page makes the final rename fail
+        os.makedirs(os.path.join(output, "section1", "page4.html", "blocker"))
+        with self.assertRaises(BuildError) as raised:
+            self.build(output, 4)
+        self.assertEqual(
+            [src for src, _ in raised.exception.errors],
+            [os.path.join(self.content, "section1", "page4.md")],
+        )
+        manifest = Manifest.load(os.path.join(output, MANIFEST_NAME))
+        self.assertEqual(manifest.pages[os.path.join("section1", "page4.md")], "")
+        self.assertNotEqual(manifest.pages[os.path.join("section1", "page7.md")], "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
+import io
 import unittest
 
-from src.htmlnode import HTMLNode, LeafNode, ParentNode
+from src.htmlnode import HTMLNode, LeafNode, ParentNode, RawNode, escape
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -115,5 +116,65 @@ class TestParentNode(unittest.TestCase):
         )
 
 
+class TestStreamingHTML(unittest.TestCase):
+    def test_iter_html_chunks(self):
+        node = ParentNode("p", [LeafNode(None, "a"), LeafNode("b", "c")])
+        self.assertEqual(list(node.iter_html()), ["<p>", "a", "<b>c</b>", "</p>"])
+
+    def test_write_to(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode("i", "x")])])
+        file = io.StringIO()
+        node.write_to(file)
+        self.assertEqual(file.getvalue(), node.to_html())
+
+    def test_deep_tree_does_not_recurse(self):
+        node = LeafNode(None, "deep")
+        for _ in range(10000):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span>" * 10000 + "deep</span>"))
+        self.assertEqual(len(html), len("<span></span>") * 10000 + len("deep"))
+
+    def test_generator_children(self):
+        node = ParentNode("ul", (LeafNode("li", str(i)) for i in range(3)))
+        self.assertEqual(node.to_html(), "<ul><li>0</li><li>1</li><li>2</li></ul>")
+
+    def test_error_in_nested_child(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode("b", "")])])
+        with self.assertRaises(ValueError):
+            node.to_html()
+
+
+class TestEscaping(unittest.TestCase):
+    def test_escape(self):
+        self.assertEqual(escape("plain text"), "plain text")
+        self.assertEqual(escape('a < b && "c" > d'), 'a &lt; b &amp;&amp; "c" &gt; d')
+
+    def test_leaf_values_are_escaped(self):
+        self.assertEqual(LeafNode(None, "AT&T").to_html(), "AT&amp;T")
+        self.assertEqual(
+            LeafNode("code", "<script>").to_html(), "<code>&lt;script&gt;</code>"
+        )
+
+    def test_props_are_escaped(self):
+        node = LeafNode("a", "link", {"href": '/search?q="x"&page=<1>'})
+        self.assertEqual(
+            node.to_html(),
+            '<a href="/search?q=&quot;x&quot;&amp;page=&lt;1&gt;">link</a>',
+        )
+
+    def test_props_html_is_updated_when_props_are_set(self):
+        node = LeafNode("a", "link", {"href": "/"})
+        node.props = {"href": "/a&b"}
+        self.assertEqual(node.props, {"href": "/a&b"})
+        self.assertEqual(node.to_html(), '<a href="/a&amp;b">link</a>')
+        node.props = None
+        self.assertEqual(node.to_html(), "<a>link</a>")
+
+    def test_raw_nodes_are_not_escaped(self):
+        node = ParentNode("div", [RawNode("<p>a &amp; b</p>")])
+        self.assertEqual(node.to_html(), "<div><p>a &amp; b</p></div>")
+
+
 if __name__ == "__main__":
     unittest.main()
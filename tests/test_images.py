@@ -0,0 +1,116 @@
+import contextlib
+import io
+import os
+import struct
+import unittest
+from unittest import mock
+
+from src.images import image_size, is_image
+from src.main import image_dimensions, main
+from src.textnode import TextNode, TextType
+from src.urls import UrlResolver
+from tests.helpers import TempDirTestCase
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\x0dIHDR" + struct.pack(">II", 640, 480)
+GIF = b"GIF89a" + struct.pack("<HH", 32, 16) + b"\x00" * 20
+JPEG = (
+    b"\xff\xd8"
+    # An APP1 segment before the frame header, as cameras write EXIF data
+    + b"\xff\xe1"
+    + struct.pack(">H", 1002)
+    + b"\x00" * 1000
+    + b"\xff\xc0"
+    + struct.pack(">HBHH", 17, 8, 300, 400)
+    + b"\x00" * 20
+)
+
+
+class TestImageSize(TempDirTestCase):
+    def size(self, name: str, data: bytes) -> tuple[int, int] | None:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as file:
+            file.write(data)
+        return image_size(path)
+
+    def test_headers(self):
+        self.assertEqual(self.size("a.png", PNG + b"\x00" * 100), (640, 480))
+        self.assertEqual(self.size("a.gif", GIF), (32, 16))
+        self.assertEqual(self.size("a.jpg", JPEG), (400, 300))
+
+    def test_unknown_or_truncated_files(self):
+        self.assertIsNone(self.size("a.png", PNG[:20]))
+        self.assertIsNone(self.size("a.jpg", JPEG[:600]))
+        self.assertIsNone(self.size("a.webp", b"RIFF\x00\x00\x00\x00WEBP"))
+        self.assertIsNone(self.size("empty.png", b""))
+
+    def test_is_image(self):
+        self.assertTrue(is_image("images/Tree.JPG"))
+        self.assertFalse(is_image("index.css"))
+
+
+class TestImageAttributes(unittest.TestCase):
+    def test_disabled_by_default(self):
+        image = TextNode("tree", TextType.IMAGE, "/images/tree.png")
+        self.assertEqual(
+            image.to_html_node(UrlResolver("/site/")).to_html(),
+            '<img src="/site/images/tree.png" alt="tree"></img>',
+        )
+
+    def test_known_and_unknown_images(self):
+        resolver = UrlResolver("/", images={"images/tree.png": (640, 480)})
+        known = TextNode("tree", TextType.IMAGE, "/images/tree.png?v=2")
+        remote = TextNode("cat", TextType.IMAGE, "https://example.com/cat.png")
+        self.assertEqual(
+            known.to_html_node(resolver).to_html(minify=True),
+            '<img src="/images/tree.png?v=2" alt="tree" width="640" height="480" '
+            'loading="lazy" decoding="async">',
+        )
+        self.assertEqual(
+            remote.to_html_node(resolver).to_html(minify=True),
+            '<img src="https://example.com/cat.png" alt="cat" loading="lazy" '
+            'decoding="async">',
+        )
+
+    def test_dimensions_change_the_key(self):
+        first = UrlResolver("/", images={"a.png": (1, 2)})
+        second = UrlResolver("/", images={"a.png": (2, 2)})
+        self.assertNotEqual(first.key, second.key)
+        self.assertNotEqual(UrlResolver("/", images={}).key, UrlResolver("/").key)
+
+
+class TestImageDimensions(TempDirTestCase):
+    chdir = True
+
+    def setUp(self) -> None:
+        super().setUp()
+        os.makedirs("static/images")
+        with open("static/images/tree.png", "wb") as file:
+            file.write(PNG)
+        self.write("template.html", "{{ Content }}")
+        self.write("content/index.md", "# Home\n\n![tree](/images/tree.png)")
+
+    def build(self, **kwargs) -> str:
+        with contextlib.redirect_stdout(io.StringIO()):
+            main("/", "public", incremental=True, **kwargs)
+        with open("public/index.html") as file:
+            return file.read()
+
+    def test_headers_are_read_once(self):
+        html = self.build(lazy_images=True)
+        self.assertIn('width="640" height="480" loading="lazy"', html)
+        with mock.patch("src.main.image_size") as size:
+            self.build(lazy_images=True)
+        size.assert_not_called()
+        self.assertNotIn("loading", self.build())
+
+    def test_cache_is_keyed_by_content(self):
+        path = os.path.join("images", "tree.png")
+        previous = {path: ["digest", 1, 1]}
+        images = image_dimensions("static", {path: "digest"}, previous)
+        self.assertEqual(images, previous)
+        images = image_dimensions("static", {path: "changed"}, previous)
+        self.assertEqual(images, {path: ["changed", 640, 480]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src.main import BuildError, generate_pages
+from tests.helpers import TempDirTestCase
+
+TEMPLATE = '<title>{{ Title }}</title><a href="/">Home</a>{{ Content }}'
+
+
+class TestGeneratePages(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.write(self.template, TEMPLATE)
+        for i in range(8):
+            self.write(
+                os.path.join(self.content, f"section{i % 3}", f"page{i}.md"),
+                f"# Page {i}\n\nSome **bold** text and a [link](/page{i}).\n\n"
+                "- one\n- two",
+            )
+
+    def read_tree(self, root: str) -> dict[str, bytes]:
+        tree = {}
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                with open(path, "rb") as file:
+                    tree[os.path.relpath(path, root)] = file.read()
+        return tree
+
+    def test_parallel_output_matches_serial(self):
+        serial = os.path.join(self.tmp.name, "serial")
+        parallel = os.path.join(self.tmp.name, "parallel")
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(self.content, serial, self.template, "/base/")
+            generate_pages(self.content, parallel, self.template, "/base/", jobs=4)
+        self.assertEqual(self.read_tree(serial), self.read_tree(parallel))
+
+    def test_errors_are_reported_in_page_order(self):
+        self.write(os.path.join(self.content, "b.md"), "No title")
+        self.write(os.path.join(self.content, "a", "index.md"), "Still no title")
+        for jobs in (1, 4):
+            output = os.path.join(self.tmp.name, f"out{jobs}")
+            with (
+                self.assertRaises(BuildError) as context,
+                contextlib.redirect_stdout(io.StringIO()),
+            ):
+                generate_pages(self.content, output, self.template, "/", jobs=jobs)
+            self.assertEqual(
+                [(page, str(error)) for page, error in context.exception.errors],
+                [
+                    (os.path.join(self.content, "a/index.md"), "No title header found"),
+                    (os.path.join(self.content, "b.md"), "No title header found"),
+                ],
+            )
+            self.assertTrue(
+                os.path.exists(os.path.join(output, "section0", "page0.html"))
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from src.main import generate_pages
+from src.manifest import MANIFEST_NAME, Manifest, hash_bytes, hash_file
+from tests.helpers import TempDirTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+
+
+class TestManifest(unittest.TestCase):
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, MANIFEST_NAME)
+            manifest = Manifest("abc", "def", {"index.md": "123"})
+            manifest.save(path)
+            self.assertEqual(Manifest.load(path), manifest)
+
+    def test_load_missing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = Manifest.load(os.path.join(tmp, MANIFEST_NAME))
+            self.assertEqual(manifest, Manifest())
+
+    def test_hash_file_matches_bytes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "file.md")
+            with open(path, "wb") as file:
+                file.write(b"# Hello")
+            self.assertEqual(hash_file(path), hash_bytes(b"# Hello"))
+
+    def test_invalidates_all(self):
+        manifest = Manifest("template", "base")
+        self.assertFalse(manifest.invalidates_all(Manifest("template", "base")))
+        self.assertTrue(manifest.invalidates_all(Manifest("other", "base")))
+        self.assertTrue(manifest.invalidates_all(Manifest("template", "other")))
+
+
+class TestIncrementalBuild(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.write(self.template, TEMPLATE)
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post")
+
+    def build(self, basepath: str = "/") -> dict[str, int]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(self.content, self.output, self.template, basepath, True)
+        return {
+            page: os.stat(os.path.join(self.output, page)).st_mtime_ns
+            for page in ("index.html", "blog/post.html")
+            if os.path.exists(os.path.join(self.output, page))
+        }
+
+    def touch_outputs(self) -> None:
+        for page in ("index.html", "blog/post.html"):
+            os.utime(os.path.join(self.output, page), ns=(0, 0))
+
+    def test_unchanged_pages_are_skipped(self):
+        self.build()
+        self.touch_outputs()
+        self.assertEqual(self.build(), {"index.html": 0, "blog/post.html": 0})
+
+    def test_changed_page_is_rebuilt(self):
+        self.build()
+        self.touch_outputs()
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Changed")
+        mtimes = self.build()
+        self.assertEqual(mtimes["index.html"], 0)
+        self.assertNotEqual(mtimes["blog/post.html"], 0)
+        with open(os.path.join(self.output, "blog", "post.html")) as file:
+            self.assertIn("<title>Changed</title>", file.read())
+
+    def test_template_change_rebuilds_everything(self):
+        self.build()
+        self.touch_outputs()
+        self.write(self.template, f"<!doctype html>{TEMPLATE}")
+        self.assertNotIn(0, self.build().values())
+
+    def test_basepath_change_rebuilds_everything(self):
+        self.build()
+        self.touch_outputs()
+        self.assertNotIn(0, self.build("/site/").values())
+
+    def test_removed_page_is_deleted(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        self.assertEqual(list(self.build()), ["index.html"])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog")))
+        manifest = Manifest.load(os.path.join(self.output, MANIFEST_NAME))
+        self.assertEqual(list(manifest.pages), ["index.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
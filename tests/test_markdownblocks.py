@@ -1,7 +1,16 @@
+import io
 import unittest
 
-from src.blocknode import BlockNode, BlockType
-from src.markdown_blocks import markdown_to_blocks, markdown_to_html
+from src.blocknode import BlockNode, BlockType, Heading
+from src.cache import LRUCache
+from src.markdown_blocks import (
+    extract_title,
+    iter_blocks,
+    markdown_to_blocks,
+    markdown_to_html,
+    parse_markdown,
+    stream_markdown_to_html,
+)
 
 
 class TestMarkdownBlocks(unittest.TestCase):
@@ -198,5 +207,90 @@ class TestMarkdownBlocks(unittest.TestCase):
         )
 
 
+class TestStreamingBlocks(unittest.TestCase):
+    def test_fenced_code_with_blank_lines(self):
+        md = "Intro\n\n```\nfirst\n\n\nsecond\n```\n\nOutro"
+        blocks = markdown_to_blocks(md)
+        self.assertEqual(
+            [block.block_type for block in blocks],
+            [BlockType.PARAGRAPH, BlockType.CODE, BlockType.PARAGRAPH],
+        )
+        self.assertEqual(
+            blocks[1].to_html_node().to_html(),
+            "<pre><code>first\n\n\nsecond\n</code></pre>",
+        )
+
+    def test_fenced_code_keeps_its_indentation(self):
+        md = "  ```\n  def f():\n      x = 1\n\n\n      return x\n  ```"
+        self.assertEqual(
+            markdown_to_html(md).to_html(),
+            "<div><pre><code>"
+            "def f():\n    x = 1\n\n\n    return x\n"
+            "</code></pre></div>",
+        )
+
+    def test_fence_with_language_and_inline_fence(self):
+        md = "```python\nx = 1\n\ny = 2```\n\nUse ``` inline\n\nNext"
+        blocks = markdown_to_blocks(md)
+        self.assertEqual(
+            blocks,
+            [
+                BlockNode("```python\nx = 1\n\ny = 2```"),
+                BlockNode("Use ``` inline"),
+                BlockNode("Next"),
+            ],
+        )
+
+    def test_blocks_are_yielded_lazily(self):
+        consumed = []
+
+        def lines():
+            for line in ["# Title\n", "\n", "Body\n", "\n", "More\n"]:
+                consumed.append(line)
+                yield line
+
+        blocks = iter_blocks(lines())
+        self.assertEqual(next(blocks), BlockNode("# Title"))
+        self.assertEqual(consumed, ["# Title\n", "\n"])
+        self.assertEqual(list(blocks), [BlockNode("Body"), BlockNode("More")])
+
+    def test_stream_matches_markdown_to_html(self):
+        md = "# Title\n\nSome **bold** text\n\n- a\n- b\n\n> quote\n"
+        self.assertEqual(
+            stream_markdown_to_html(io.StringIO(md)).to_html(),
+            markdown_to_html(md).to_html(),
+        )
+
+
+class TestParseMarkdown(unittest.TestCase):
+    def test_title_and_headings(self):
+        md = "  # The **Title**\n\nIntro\n\n## Part one\n\n```\n# not a heading\n```"
+        document = parse_markdown(md, cache=None)
+        self.assertEqual(document.title, "The **Title**")
+        self.assertEqual(
+            document.headings, [Heading(1, "The **Title**"), Heading(2, "Part one")]
+        )
+        self.assertEqual(document.html.to_html(), markdown_to_html(md).to_html())
+
+    def test_title_must_be_first_block(self):
+        self.assertIsNone(parse_markdown("Intro\n\n# Title").title)
+        self.assertIsNone(parse_markdown("## Subtitle").title)
+        self.assertIsNone(parse_markdown("").title)
+
+    def test_rendered_nodes_are_counted(self):
+        md = "\n\n".join(f"Paragraph {i} with **bold** and _italic_" for i in range(10))
+        self.assertEqual(parse_markdown(md, cache=None).nodes, 0)
+        self.assertEqual(parse_markdown(md, cache=None, count=True).nodes, 51)
+        cache = LRUCache()
+        self.assertEqual(parse_markdown(md, cache, count=True).nodes, 51)
+        # Cached blocks are not rendered again, only the page wrapper is
+        self.assertEqual(parse_markdown(md, cache, count=True).nodes, 1)
+
+    def test_extract_title(self):
+        self.assertEqual(extract_title("\n# Title\n\nBody"), "Title")
+        self.assertIsNone(extract_title("Body\n\n# Title"))
+        self.assertIsNone(extract_title(""))
+
+
 if __name__ == "__main__":
     unittest.main()
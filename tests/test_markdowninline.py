@@ -1,13 +1,27 @@
+import random
 import unittest
 
 from src.markdown_inline import (
     split_nodes_delimiter,
     split_nodes_image,
     split_nodes_link,
+    text_to_textnodes,
     to_textnodes,
 )
 from src.textnode import TextNode, TextType
 
+FRAGMENTS = ["a", "b c", " ", "**", "*", "_", "`", "!", "[", "]", "(", ")", "](", "\n"]
+FRAGMENTS += ["![", "![x](y.png)", "[z](/w)", "[l](u_v)", "https://a.b/c"]
+
+
+def five_pass_textnodes(text: str) -> list[TextNode]:
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    return split_nodes_link(nodes)
+
 
 class TestInlineMarkdown(unittest.TestCase):
     def test_split_images(self):
@@ -428,5 +442,46 @@ class TestInlineMarkdown(unittest.TestCase):
             split_nodes_delimiter([node], "*", TextType.ITALIC)
 
 
+class TestSinglePassTokenizer(unittest.TestCase):
+    def assert_same_as_five_pass(self, text: str) -> None:
+        try:
+            expected = five_pass_textnodes(text)
+        except ValueError:
+            with self.assertRaises(ValueError, msg=repr(text)):
+                text_to_textnodes(text)
+            return
+        self.assertListEqual(expected, text_to_textnodes(text), repr(text))
+
+    def test_matches_five_pass_pipeline(self):
+        rng = random.Random(1234)
+        for _ in range(20000):
+            size = rng.randint(0, 12)
+            self.assert_same_as_five_pass("".join(rng.choices(FRAGMENTS, k=size)))
+
+    def test_edge_cases(self):
+        cases = [
+            "[a](b ![c](d))",
+            "[![img](a)](b)",
+            "![a](b_c)_d_",
+            "**[a](b)**[c](d)",
+            "_a **b** c_",
+            "`a_b`",
+            "`a**b**c`",
+            "****",
+            "***a***",
+            "!![a](b)",
+            "a``b",
+            "[a](b)\n[c](d)",
+            "![a]\n(b)",
+        ]
+        for text in cases:
+            self.assert_same_as_five_pass(text)
+
+    def test_unbalanced_raises(self):
+        for text in ("**a", "_a", "`a", "_a **b**_", "`a_b`"):
+            with self.assertRaises(ValueError):
+                text_to_textnodes(text)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,119 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from src.cache import LRUCache
+from src.htmlnode import LeafNode, ParentNode
+from src.main import generate_pages
+from src.markdown_blocks import markdown_to_html
+from src.template import Template
+
+CODE = "```\ndef main():\n    print('<indented>')\n\n\n    return  1\n```"
+
+
+class TestMinifyTemplate(unittest.TestCase):
+    def test_block_whitespace_is_removed(self):
+        template = Template(
+            "<!doctype html>\n<html>\n    <head>\n        <title>{{ Title }}</title>\n"
+            '        <meta charset="utf-8" />\n    </head>\n\n    <body>\n'
+            "        <article>{{ Content }}</article>\n    </body>\n</html>\n"
+        )
+        self.assertEqual(
+            template.minify().render(Title="T", Content="<p>x</p>"),
+            '<!doctype html><html><head><title>T</title><meta charset="utf-8">'
+            "</head><body><article><p>x</p></article></body></html>",
+        )
+
+    def test_inline_whitespace_is_collapsed(self):
+        template = Template("<p>\n  Hello   <b>big</b>\n   <i>world</i>  </p>")
+        self.assertEqual(
+            template.minify().render(), "<p>Hello <b>big</b> <i>world</i></p>"
+        )
+
+    def test_whitespace_next_to_slots_is_kept(self):
+        template = Template("<p>By   {{ Author }}   on {{ Date }}</p>")
+        self.assertEqual(
+            template.minify().render(Author="me", Date="today"),
+            "<p>By me on today</p>",
+        )
+
+    def test_raw_text_is_kept(self):
+        source = (
+            "<div>\n  <pre>  a\n    b  </pre>\n"
+            "  <script>\n  if (a < b) { x = '<br />'; }\n  </script>\n"
+            "  <textarea>\n  keep\n</textarea>\n</div>"
+        )
+        self.assertEqual(
+            Template(source).minify().render(),
+            "<div><pre>  a\n    b  </pre><script>\n  if (a < b) { x = '<br />'; }\n"
+            "  </script><textarea>\n  keep\n</textarea></div>",
+        )
+
+    def test_comments_are_removed(self):
+        template = Template("<div>\n  <!-- <p>old</p> -->\n  <p>new</p>\n</div>")
+        self.assertEqual(template.minify().render(), "<div><p>new</p></div>")
+
+    def test_slot_inside_tag(self):
+        template = Template('<a  href="{{ Url }}"  class="x" >\n  link\n</a>')
+        self.assertEqual(
+            template.minify().render(Url="/a"), '<a  href="/a"  class="x" > link </a>'
+        )
+
+    def test_original_is_untouched(self):
+        template = Template("<div>\n  {{ Content }}\n</div>")
+        minified = template.minify()
+        self.assertEqual(minified.render(Content="x"), "<div>x</div>")
+        self.assertEqual(template.render(Content="x"), "<div>\n  x\n</div>")
+        self.assertEqual(minified.slots, template.slots)
+
+
+class TestMinifyNodes(unittest.TestCase):
+    def test_void_elements_have_no_end_tag(self):
+        node = ParentNode("p", [LeafNode("img", "", {"src": "/a.png", "alt": ""})])
+        self.assertEqual(node.to_html(minify=True), '<p><img src="/a.png" alt=""></p>')
+        self.assertEqual(node.to_html(), '<p><img src="/a.png" alt=""></img></p>')
+
+    def test_template_renders_nodes_minified(self):
+        node = ParentNode("p", [LeafNode("img", "", {"src": "/a.png"})])
+        template = Template("<div>\n  {{ Content }}\n</div>").minify()
+        self.assertEqual(
+            template.render(Content=node), '<div><p><img src="/a.png"></p></div>'
+        )
+
+    def test_block_cache_is_keyed_by_minify(self):
+        cache = LRUCache()
+        md = "![tree](/tree.png)"
+        markdown_to_html(md, cache).to_html()
+        self.assertEqual(
+            markdown_to_html(md, cache, minify=True).to_html(),
+            '<div><p><img src="/tree.png" alt="tree"></p></div>',
+        )
+
+    def test_code_blocks_are_kept_byte_for_byte(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            os.makedirs(content)
+            template = os.path.join(tmp, "template.html")
+            with open(template, "w") as file:
+                file.write("<html>\n  <body>\n    {{ Content }}\n  </body>\n</html>\n")
+            with open(os.path.join(content, "index.md"), "w") as file:
+                file.write(f"# Code\n\n{CODE}")
+            outputs = []
+            for minify in (False, True):
+                output = os.path.join(tmp, f"public{minify}")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate_pages(content, output, template, "/", minify=minify)
+                with open(os.path.join(output, "index.html")) as file:
+                    outputs.append(file.read())
+        plain, minified = (output[output.index("<pre>") :] for output in outputs)
+        code = plain[: plain.index("</pre>")]
+        self.assertIn("return  1\n", code)
+        self.assertTrue(minified.startswith(code + "</pre>"))
+        self.assertTrue(outputs[1].startswith("<html><body><div><h1>Code</h1>"))
+        self.assertLess(len(outputs[1]), len(outputs[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import contextlib
+import io
+import os
+import unittest
+from unittest import mock
+
+from src.main import generate_pages
+from src.parse_cache import ParseCache, parser_version
+from src.stats import BuildStats
+from tests.helpers import TempDirTestCase
+
+
+class TestParseCache(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = os.path.join(self.tmp.name, "cache")
+
+    def test_round_trip(self):
+        cache = ParseCache(self.directory)
+        self.assertIsNone(cache.get("# Title"))
+        cache.put("# Title", "<div><h1>Title</h1></div>")
+        self.assertEqual(cache.get("# Title"), "<div><h1>Title</h1></div>")
+        self.assertIsNone(cache.get("# Other"))
+
+    def test_parser_version_invalidates(self):
+        ParseCache(self.directory, "old").put("# Title", "<div>old</div>")
+        self.assertIsNone(ParseCache(self.directory, "new").get("# Title"))
+
+    def test_prune_removes_other_versions(self):
+        ParseCache(self.directory, "old").put("# Title", "<div>old</div>")
+        current = ParseCache(self.directory, "new")
+        current.put("# Title", "<div>new</div>")
+        current.prune()
+        self.assertEqual(os.listdir(self.directory), ["new"])
+
+    def test_default_version_hashes_parser_sources(self):
+        self.assertEqual(ParseCache(self.directory).version, parser_version()[:16])
+
+    def test_unwritable_cache_is_ignored(self):
+        blocker = os.path.join(self.tmp.name, "file")
+        open(blocker, "w").close()
+        cache = ParseCache(blocker)
+        cache.put("# Title", "<div></div>")
+        self.assertIsNone(cache.get("# Title"))
+
+
+class TestTemplateOnlyRebuild(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        self.template = self.write("template.html", "<h1>{{ Title }}</h1>{{ Content }}")
+        self.cache = ParseCache(os.path.join(self.tmp.name, "cache"))
+        for i in range(3):
+            self.write(f"content/page{i}.md", f"# Page {i}\n\nA")
+
+    def build(self) -> BuildStats:
+        stats = BuildStats()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(
+                self.content,
+                self.output,
+                self.template,
+                "/",
+                True,
+                stats=stats,
+                parse_cache=self.cache,
+            )
+        return stats
+
+    def test_template_change_skips_parsing(self):
+        self.assertEqual(self.build().counters["parse_cache_misses"], 3)
+        self.write("template.html", "<main>{{ Title }}{{ Content }}</main>")
+        with mock.patch("src.main.parse_markdown") as parse_markdown:
+            stats = self.build()
+        parse_markdown.assert_not_called()
+        self.assertEqual(stats.counters["parse_cache_hits"], 3)
+        self.assertEqual(
+            self.read("public/page1.html"),
+            "<main>Page 1<div><h1>Page 1</h1><p>A</p></div></main>",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
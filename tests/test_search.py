@@ -0,0 +1,184 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.cache import LRUCache
+from src.main import generate_pages
+from src.manifest import MANIFEST_NAME, Manifest
+from src.markdown_blocks import parse_markdown
+from src.search import (
+    SEARCH_DIRECTORY,
+    SearchEntry,
+    SearchIndex,
+    shard_name,
+    tokenize,
+)
+from tests.helpers import TempDirTestCase
+
+PAGE = (
+    "# The {name}\n\n"
+    "Elves of **Rivendell** and [the {name}](/{name}) by ![a tree](/tree.png)\n\n"
+    "```\ncodeword\n```\n"
+)
+
+
+class TestTokenize(unittest.TestCase):
+    def test_terms_are_counted_case_insensitively(self):
+        self.assertEqual(
+            tokenize("The ring, the RING! Élan a 42"),
+            {"the": 2, "ring": 2, "élan": 1, "42": 1},
+        )
+
+    def test_shard_name(self):
+        self.assertEqual(shard_name("rivendell"), "ri")
+        self.assertEqual(shard_name("42"), "42")
+        self.assertEqual(shard_name("élan"), "xc3a96c")
+        self.assertEqual(shard_name("_x"), "x5f78")
+
+
+class TestDocumentText(unittest.TestCase):
+    def test_text_comes_from_text_nodes(self):
+        md = PAGE.format(name="ring")
+        expected = "The ring Elves of  Rivendell  and  the ring  by  a tree"
+        self.assertEqual(parse_markdown(md, cache=None, search=True).text, expected)
+        self.assertIsNone(parse_markdown(md, cache=None).text)
+
+    def test_cached_blocks_keep_their_text(self):
+        cache = LRUCache()
+        md = PAGE.format(name="ring")
+        parse_markdown(md, cache)
+        first = parse_markdown(md, cache, search=True)
+        second = parse_markdown(md, cache, search=True)
+        self.assertEqual(first.text, second.text)
+        self.assertEqual(first.html.to_html(), second.html.to_html())
+
+    def test_blocks_take_one_cache_entry(self):
+        md = PAGE.format(name="ring")
+        plain, searched = LRUCache(), LRUCache()
+        parse_markdown(md, plain)
+        parse_markdown(md, searched, search=True)
+        self.assertEqual(len(searched), len(plain))
+        self.assertEqual((searched.hits, searched.misses), (0, len(plain)))
+
+
+class TestSearchIndex(unittest.TestCase):
+    def test_round_trip_and_stable_ids(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = SearchIndex(tmp)
+            first = index.add("/a/", SearchEntry("A", {"ring": 2, "elf": 1}))
+            second = index.add("/b/", SearchEntry("B", {"ring": 1}))
+            index.save()
+            with open(os.path.join(tmp, "ri.json")) as file:
+                self.assertEqual(json.load(file), {"ring": [0, 2, 1, 1]})
+
+            index = SearchIndex.load(tmp)
+            # Shards are only read once a page changes
+            self.assertEqual(index.postings, {})
+            index.remove([first])
+            self.assertEqual(index.postings, {"ring": {second: 1}})
+            self.assertEqual(index.save(), 2)
+            self.assertFalse(os.path.exists(os.path.join(tmp, "el.json")))
+            self.assertEqual(index.add("/c/", SearchEntry("C", {"orc": 1})), first)
+            self.assertEqual(index.docs, [["/c/", "C"], ["/b/", "B"]])
+            self.assertTrue(index.covers([first, second]))
+            self.assertFalse(index.covers([2]))
+
+
+class TestSearchBuild(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        self.template = self.write("template.html", "{{ Content }}")
+        for name in ("ring", "tree", "orc"):
+            self.write_page(name, PAGE.format(name=name))
+
+    def write_page(self, name: str, contents: str) -> None:
+        self.write(os.path.join("content", name, "index.md"), contents)
+
+    def build(self, search: bool = True, jobs: int = 1) -> Manifest:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(
+                self.content,
+                self.output,
+                self.template,
+                "/site/",
+                incremental=True,
+                jobs=jobs,
+                search=search,
+            )
+        return Manifest.load(os.path.join(self.output, MANIFEST_NAME))
+
+    def shard(self, name: str) -> dict:
+        with open(os.path.join(self.output, SEARCH_DIRECTORY, f"{name}.json")) as file:
+            return json.load(file)
+
+    def test_pages_are_indexed(self):
+        manifest = self.build()
+        ids = manifest.search
+        self.assertEqual(sorted(ids.values()), [0, 1, 2])
+        self.assertEqual(
+            self.shard("or")["orc"], [ids[os.path.join("orc", "index.md")], 2]
+        )
+        self.assertEqual(len(self.shard("ri")["rivendell"]), 6)
+        # Code blocks are not text nodes, so they are not indexed
+        shards = os.path.join(self.output, SEARCH_DIRECTORY)
+        self.assertFalse(os.path.exists(os.path.join(shards, "co.json")))
+        index = SearchIndex.load(shards)
+        self.assertIn(["/site/tree/", "The tree"], index.docs)
+
+    def test_incremental_update(self):
+        ids = self.build().search
+        shards = os.path.join(self.output, SEARCH_DIRECTORY)
+        self.write_page("tree", "# The tree\n\nEnts")
+        self.write_page("balrog", "# Balrog\n\nShadow and flame")
+        os.remove(os.path.join(self.content, "orc", "index.md"))
+        manifest = self.build()
+
+        tree = os.path.join("tree", "index.md")
+        balrog = os.path.join("balrog", "index.md")
+        self.assertEqual(manifest.search[tree], ids[tree])
+        # The new page takes the id the removed page left behind
+        self.assertEqual(manifest.search[balrog], ids[os.path.join("orc", "index.md")])
+        self.assertEqual(self.shard("en")["ents"], [ids[tree], 1])
+        self.assertEqual(len(self.shard("el")["elves"]), 2)
+        self.assertFalse(os.path.exists(os.path.join(shards, "or.json")))
+        self.assertEqual(self.shard("sh")["shadow"], [manifest.search[balrog], 1])
+
+    def test_unchanged_shards_are_not_rewritten(self):
+        self.build()
+        shards = os.path.join(self.output, SEARCH_DIRECTORY)
+
+        def mtimes() -> dict[str, int]:
+            return {
+                entry.name: entry.stat().st_mtime_ns for entry in os.scandir(shards)
+            }
+
+        before = mtimes()
+        self.write_page("ring", PAGE.format(name="ring") + "\nMordor")
+        self.build()
+        after = mtimes()
+        changed = sorted(name for name in after if after[name] != before.get(name))
+        self.assertEqual(changed, ["mo.json"])
+
+    def test_matches_parallel_build_and_is_removed_when_disabled(self):
+        self.build()
+        serial = self.shard("ri")
+        shards = os.path.join(self.output, SEARCH_DIRECTORY)
+        for name in os.listdir(shards):
+            os.remove(os.path.join(shards, name))
+        # A missing index is rebuilt in full, and leftover shards are removed
+        with open(os.path.join(shards, "zz.json"), "w") as file:
+            file.write("{}")
+        self.build(jobs=2)
+        self.assertFalse(os.path.exists(os.path.join(shards, "zz.json")))
+        self.assertEqual(self.shard("ri"), serial)
+        self.assertEqual(self.build(search=False).search, {})
+        self.assertFalse(os.path.exists(shards))
+
+
+if __name__ == "__main__":
+    unittest.main()
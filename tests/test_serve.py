@@ -0,0 +1,146 @@
+import contextlib
+import gzip
+import io
+import os
+import threading
+import unittest
+import urllib.request
+
+from src.main import main, rebuild
+from src.serve import RELOAD_PATH, LiveReload, Watcher, start_server
+from tests.helpers import TempDirTestCase
+
+
+class SiteTestCase(TempDirTestCase):
+    chdir = True
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.write("template.html", "<body><h1>{{ Title }}</h1>{{ Content }}</body>")
+        self.write("static/index.css", "body {}")
+        self.write("content/index.md", "# Home\n\nWelcome")
+        self.write("content/blog/post.md", "# Post\n\nA [link](/blog)")
+
+    def write(self, path: str, contents: str) -> str:
+        path = super().write(path, contents)
+        # Keep mtimes distinct even on filesystems with coarse timestamps
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        return path
+
+
+class TestWatcher(SiteTestCase):
+    def test_detects_changes(self):
+        watcher = Watcher(["./content", "./static", "./template.html"])
+        self.assertEqual(watcher.poll(), set())
+
+        self.write("content/blog/post.md", "# Post\n\nEdited")
+        self.write("content/new/page.md", "# New")
+        os.remove("static/index.css")
+        self.assertEqual(
+            watcher.poll(),
+            {
+                "./content/blog/post.md",
+                "./content/new/page.md",
+                "./static/index.css",
+            },
+        )
+        self.assertEqual(watcher.poll(), set())
+
+    def test_detects_template_changes(self):
+        watcher = Watcher(["./template.html"])
+        self.write("template.html", "{{ Content }}")
+        self.assertEqual(watcher.poll(), {"./template.html"})
+
+
+class TestRebuild(SiteTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        with contextlib.redirect_stdout(io.StringIO()):
+            main("/", "public")
+
+    def rebuild(self, changes: set[str], **options) -> str:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            rebuild(changes, "/", "public", **options)
+        return output.getvalue()
+
+    def test_rebuilds_only_changed_pages(self):
+        self.write("content/blog/post.md", "# Edited\n\nText")
+        log = self.rebuild({"./content/blog/post.md"})
+        self.assertEqual(log.count("Generating page"), 1)
+        self.assertIn("<h1>Edited</h1>", self.read("public/blog/post.html"))
+
+    def test_added_and_removed_pages(self):
+        self.write("content/new.md", "# New")
+        os.remove("content/index.md")
+        self.rebuild({"./content/new.md", "./content/index.md"})
+        self.assertTrue(os.path.exists("public/new.html"))
+        self.assertFalse(os.path.exists("public/index.html"))
+        self.assertTrue(os.path.exists("public/blog/post.html"))
+
+    def test_template_change_rebuilds_everything(self):
+        self.write("template.html", "<main>{{ Title }}</main>")
+        log = self.rebuild({"./template.html"})
+        self.assertEqual(log.count("Generating page"), 2)
+        self.assertEqual(self.read("public/index.html"), "<main>Home</main>")
+
+    def test_gzip_sidecars_follow_rebuilt_pages(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            main("/", "public", gzip=True, gzip_threshold=0)
+        self.write("content/blog/post.md", "# Edited\n\nText")
+        self.rebuild({"./content/blog/post.md"}, gzip=True, gzip_threshold=0)
+        with gzip.open("public/blog/post.html.gz", "rt") as file:
+            self.assertEqual(file.read(), self.read("public/blog/post.html"))
+        self.assertIn("<h1>Edited</h1>", self.read("public/blog/post.html"))
+
+    def test_static_change_skips_pages(self):
+        self.write("static/index.css", "main {}")
+        log = self.rebuild({"./static/index.css"})
+        self.assertEqual(log, "")
+        self.assertEqual(self.read("public/index.css"), "main {}")
+
+
+class TestPreviewServer(SiteTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        with contextlib.redirect_stdout(io.StringIO()):
+            main("/site/", "public")
+        self.reload = LiveReload()
+        self.server = start_server("public", 0, "/site/", self.reload)
+        self.url = f"http://localhost:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def get(self, path: str) -> str:
+        with contextlib.redirect_stderr(io.StringIO()):
+            with urllib.request.urlopen(self.url + path, timeout=5) as response:
+                return response.read().decode()
+
+    def test_injects_reload_script(self):
+        html = self.get("/site/blog/post.html")
+        self.assertIn(RELOAD_PATH, html)
+        self.assertTrue(html.endswith("</body>"))
+        self.assertIn('href="/site/blog"', html)
+
+    def test_serves_static_files_unchanged(self):
+        self.assertEqual(self.get("/site/index.css"), "body {}")
+
+    def test_reload_waits_for_new_version(self):
+        threading.Timer(0.05, self.reload.notify).start()
+        self.assertEqual(self.get(f"{RELOAD_PATH}?version=0"), "1")
+
+
+class TestLiveReload(unittest.TestCase):
+    def test_wait_returns_current_version_on_timeout(self):
+        reload = LiveReload()
+        self.assertEqual(reload.wait(0, timeout=0.01), 0)
+        reload.notify()
+        self.assertEqual(reload.wait(0, timeout=0.01), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
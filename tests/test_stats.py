@@ -0,0 +1,152 @@
+import contextlib
+import io
+import json
+import os
+import time
+import unittest
+from unittest import mock
+
+from src.htmlnode import HTMLNode, LeafNode, ParentNode
+from src.main import generate_pages
+from src.stats import BuildStats, ByteCounter, NullStats, count_nodes
+from tests.helpers import TempDirTestCase
+
+
+class TestBuildStats(unittest.TestCase):
+    def test_stage_accumulates(self):
+        stats = BuildStats()
+        for _ in range(3):
+            with stats.stage("parse"):
+                pass
+        self.assertEqual(stats.stages["parse"]["calls"], 3)
+        self.assertGreaterEqual(stats.stages["parse"]["wall"], 0)
+
+    def test_stage_records_failures(self):
+        stats = BuildStats()
+        with self.assertRaises(ValueError):
+            with stats.stage("parse"):
+                raise ValueError("bad")
+        self.assertEqual(stats.stages["parse"]["calls"], 1)
+
+    def test_timed_counts_only_the_producer(self):
+        stats = BuildStats()
+
+        def walk():
+            for page in ("a.md", "b.md"):
+                time.sleep(0.01)
+                yield page
+
+        pages = []
+        for page in stats.timed("discover", walk()):
+            time.sleep(0.05)
+            pages.append(page)
+        self.assertEqual(pages, ["a.md", "b.md"])
+        self.assertGreaterEqual(stats.stages["discover"]["wall"], 0.02)
+        self.assertLess(stats.stages["discover"]["wall"], 0.1)
+        self.assertEqual(list(NullStats().timed("discover", pages)), pages)
+
+    def test_merge(self):
+        first, second = BuildStats(), BuildStats()
+        first.add_time("parse", 1.0, 0.5)
+        second.add_time("parse", 2.0, 1.5)
+        first.count("pages_rendered")
+        second.count("pages_rendered", 2)
+        second.add_page("a.md", wall=0.1, nodes=3, input_bytes=1, output_bytes=2)
+        first.merge(second)
+        self.assertEqual(first.stages["parse"], {"wall": 3.0, "cpu": 2.0, "calls": 2})
+        self.assertEqual(first.counters, {"pages_rendered": 3})
+        self.assertIn("a.md", first.pages)
+
+    def test_slowest_pages(self):
+        stats = BuildStats()
+        for page, wall in [("a.md", 0.2), ("b.md", 0.5), ("c.md", 0.1)]:
+            stats.add_page(page, wall=wall, nodes=1, input_bytes=1, output_bytes=1)
+        self.assertEqual(
+            [page for page, _ in stats.slowest_pages(2)], ["b.md", "a.md"]
+        )
+        self.assertIn("Slowest 2 pages", stats.summary(2))
+
+    def test_null_stats_records_nothing(self):
+        stats = NullStats()
+        with stats.stage("parse"):
+            stats.count("pages_rendered")
+        self.assertEqual(stats.stages, {})
+        self.assertEqual(stats.counters, {})
+
+    def test_count_nodes(self):
+        node = ParentNode(
+            "div", [LeafNode("b", "x"), ParentNode("p", [LeafNode(None, "y")])]
+        )
+        self.assertEqual(count_nodes(node), 4)
+
+    def test_byte_counter(self):
+        counter = ByteCounter(iter(["<p>", "é", "</p>"]))
+        self.assertEqual("".join(counter), "<p>é</p>")
+        self.assertEqual(counter.size, 9)
+
+
+class TestBuildStatsReport(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        self.template = self.write(
+            "template.html", "<title>{{ Title }}</title>{{ Content }}"
+        )
+        for i in range(3):
+            self.write(f"content/page{i}.md", f"# Page {i}\n\nSome **bold** text.")
+
+    def build(self, **options) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(self.content, self.output, self.template, "/", **options)
+
+    def test_parallel_stats_match_serial(self):
+        for jobs in (1, 3):
+            stats = BuildStats()
+            self.build(jobs=jobs, stats=stats)
+            self.assertEqual(stats.counters["pages_rendered"], 3)
+            self.assertEqual(stats.stages["parse"]["calls"], 3)
+            self.assertEqual(stats.stages["discover"]["calls"], 1)
+            self.assertEqual(len(stats.pages), 3)
+            output_bytes = sum(
+                os.path.getsize(os.path.join(self.output, f"page{i}.html"))
+                for i in range(3)
+            )
+            self.assertEqual(stats.counters["output_bytes"], output_bytes)
+
+    def test_streamed_pages_are_counted(self):
+        stats = BuildStats()
+        # Without a parse cache or queued writes no page is rendered to a string
+        with mock.patch.object(HTMLNode, "to_html") as to_html:
+            self.build(stats=stats, io_threads=0)
+        to_html.assert_not_called()
+        self.assertEqual(
+            self.read("public/page0.html"),
+            "<title>Page 0</title>"
+            "<div><h1>Page 0</h1><p>Some <b>bold</b> text.</p></div>",
+        )
+        output_bytes = sum(
+            os.path.getsize(os.path.join(self.output, f"page{i}.html"))
+            for i in range(3)
+        )
+        self.assertEqual(stats.counters["output_bytes"], output_bytes)
+
+    def test_incremental_counts_skipped_pages(self):
+        self.build(incremental=True)
+        stats = BuildStats()
+        self.build(incremental=True, stats=stats)
+        self.assertEqual(stats.counters, {"pages_skipped": 3})
+
+    def test_save_writes_json(self):
+        stats = BuildStats()
+        self.build(stats=stats)
+        path = os.path.join(self.tmp.name, "stats.json")
+        stats.save(path, slowest=1)
+        with open(path) as file:
+            report = json.load(file)
+        self.assertEqual(report["counters"]["pages_rendered"], 3)
+        self.assertEqual(len(report["slowest"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
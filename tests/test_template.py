@@ -0,0 +1,85 @@
+import io
+import os
+import unittest
+
+from src.htmlnode import LeafNode, ParentNode
+from src.template import Template, load_template
+from tests.helpers import TempDirTestCase
+
+
+class TestTemplate(TempDirTestCase):
+    def test_render_slots(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(template.slots, ["Title", "Content"])
+        self.assertEqual(
+            template.render(Title="Hi", Content="<p>there</p>"),
+            "<title>Hi</title><main><p>there</p></main>",
+        )
+
+    def test_render_repeated_slot(self):
+        template = Template("{{ Title }} - {{Title}}")
+        self.assertEqual(template.render(Title="A"), "A - A")
+
+    def test_render_missing_slot_kept(self):
+        template = Template("<p>{{ Title }}</p>")
+        self.assertEqual(template.render(), "<p>{{ Title }}</p>")
+
+    def test_values_are_not_rescanned(self):
+        template = Template("{{ Title }}|{{ Content }}")
+        self.assertEqual(
+            template.render(Title="{{ Content }}", Content="x"), "{{ Content }}|x"
+        )
+
+    def test_render_without_slots(self):
+        self.assertEqual(Template("plain").render(Title="x"), "plain")
+        self.assertEqual(Template("").render(), "")
+
+    def test_render_node(self):
+        template = Template("<main>{{ Content }}</main>")
+        content = ParentNode("p", [LeafNode("b", "hi")])
+        expected = "<main><p><b>hi</b></p></main>"
+        self.assertEqual(template.render(Content=content), expected)
+        file = io.StringIO()
+        template.write_to(file, Content=content)
+        self.assertEqual(file.getvalue(), expected)
+
+    def test_partial(self):
+        self.write("partials/nav.html", "<nav>{{ Title }}</nav>")
+        template = Template(
+            "<body>{{> partials/nav.html }}{{ Content }}</body>", self.tmp.name
+        )
+        self.assertEqual(
+            template.render(Title="T", Content="C"), "<body><nav>T</nav>C</body>"
+        )
+
+    def test_layout(self):
+        self.write("base.html", "<html>{{> head.html }}<body>{{ Body }}</body></html>")
+        self.write("head.html", "<title>{{ Title }}</title>")
+        template = Template("{{< base.html }}<main>{{ Content }}</main>", self.tmp.name)
+        self.assertEqual(
+            template.render(Title="T", Content="C"),
+            "<html><title>T</title><body><main>C</main></body></html>",
+        )
+
+    def test_recursive_partial_raises(self):
+        self.write("loop.html", "{{> loop.html }}")
+        with self.assertRaises(ValueError):
+            Template("{{> loop.html }}", self.tmp.name)
+
+    def test_load_template_is_cached(self):
+        path = self.write("template.html", "{{ Content }}")
+        template = load_template(path)
+        self.assertIs(load_template(path), template)
+        self.assertEqual(template.files, [path])
+
+    def test_load_template_reloads_changed_partial(self):
+        partial = self.write("footer.html", "old")
+        path = self.write("template.html", "{{> footer.html }}")
+        self.assertEqual(load_template(path).render(), "old")
+        self.write("footer.html", "new")
+        os.utime(partial, ns=(0, 0))
+        self.assertEqual(load_template(path).render(), "new")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from src.cache import LRUCache
+from src.main import generate_pages
+from src.markdown_blocks import markdown_to_html
+from src.template import Template
+from src.textnode import TextNode, TextType
+from src.urls import UrlResolver
+
+
+class CdnResolver(UrlResolver):
+    @property
+    def key(self) -> str:
+        return f"cdn,{super().key}"
+
+    def resolve(self, url: str) -> str:
+        if url.startswith("/images/"):
+            return "https://cdn.example.com" + url
+        return super().resolve(url)
+
+
+class TestUrlResolver(unittest.TestCase):
+    def test_resolve(self):
+        resolver = UrlResolver("/site/")
+        self.assertEqual(resolver.resolve("/"), "/site/")
+        self.assertEqual(resolver.resolve("/blog/tom"), "/site/blog/tom")
+        self.assertEqual(resolver.resolve("https://boot.dev"), "https://boot.dev")
+        cdn = "//cdn.example.com/a.png"
+        self.assertEqual(resolver.resolve(cdn), cdn)
+        self.assertEqual(resolver.resolve("relative/page"), "relative/page")
+
+    def test_resolve_attributes(self):
+        html = '<link href="/index.css" /><img src="/a.png" alt="/b" />'
+        self.assertEqual(
+            UrlResolver("/site/").resolve_attributes(html),
+            '<link href="/site/index.css" /><img src="/site/a.png" alt="/b" />',
+        )
+
+    def test_text_nodes(self):
+        resolver = UrlResolver("/site/")
+        link = TextNode("home", TextType.LINK, "/")
+        image = TextNode("tree", TextType.IMAGE, "/images/tree.png")
+        self.assertEqual(
+            link.to_html_node(resolver).to_html(), '<a href="/site/">home</a>'
+        )
+        self.assertEqual(
+            image.to_html_node(resolver).to_html(),
+            '<img src="/site/images/tree.png" alt="tree"></img>',
+        )
+        self.assertEqual(link.to_html_node().to_html(), '<a href="/">home</a>')
+
+
+class TestRenderTimeUrls(unittest.TestCase):
+    def test_code_is_not_rewritten(self):
+        md = '[Home](/) and `<a href="/">`\n\n```\n<img src="/a.png">\n```'
+        html = markdown_to_html(md, cache=None, resolver=UrlResolver("/site/"))
+        self.assertEqual(
+            html.to_html(),
+            '<div><p><a href="/site/">Home</a> and <code>&lt;a href="/"&gt;</code>'
+            '</p><pre><code>&lt;img src="/a.png"&gt;\n</code></pre></div>',
+        )
+
+    def test_block_cache_is_keyed_by_resolver(self):
+        cache = LRUCache()
+        md = "[Home](/)"
+        first = markdown_to_html(md, cache, UrlResolver("/a/")).to_html()
+        second = markdown_to_html(md, cache, UrlResolver("/b/")).to_html()
+        self.assertEqual(first, '<div><p><a href="/a/">Home</a></p></div>')
+        self.assertEqual(second, '<div><p><a href="/b/">Home</a></p></div>')
+
+    def test_template_slots_are_left_alone(self):
+        template = Template('<a href="/">{{ Content }}</a>{{ Missing }}')
+        resolved = template.resolve_urls(UrlResolver("/site/"))
+        self.assertEqual(
+            resolved.render(Content='<a href="/x">'),
+            '<a href="/site/"><a href="/x"></a>{{ Missing }}',
+        )
+        self.assertEqual(template.render(Content=""), '<a href="/"></a>{{ Missing }}')
+
+    def test_custom_resolver(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            template = os.path.join(tmp, "template.html")
+            content = os.path.join(tmp, "content")
+            output = os.path.join(tmp, "public")
+            os.makedirs(content)
+            with open(template, "w") as file:
+                file.write('<link href="/index.css">{{ Content }}')
+            with open(os.path.join(content, "index.md"), "w") as file:
+                file.write("# Home\n\n![tree](/images/tree.png)")
+            resolver = CdnResolver("/site/")
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages(content, output, template, "/site/", resolver=resolver)
+            with open(os.path.join(output, "index.html")) as file:
+                self.assertEqual(
+                    file.read(),
+                    '<link href="/site/index.css"><div><h1>Home</h1><p><img '
+                    'src="https://cdn.example.com/images/tree.png" alt="tree">'
+                    "</img></p></div>",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from src.main import generate_pages
+from src.walk import DEFAULT_IGNORE, ignore_matcher, iter_files
+from tests.helpers import TempDirTestCase
+
+
+class TestIterFiles(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.root = self.tmp.name
+
+    def touch(self, *paths: str) -> None:
+        for path in paths:
+            path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+    def test_matches_sorted_relative_paths(self):
+        paths = [
+            "a.md",
+            "a/b.md",
+            "a-b/c.md",
+            "a0.md",
+            "b/a/z.md",
+            "b/a.md",
+            "b/a-z.md",
+            "B.md",
+            "index.md",
+        ]
+        self.touch(*paths)
+        self.assertEqual(
+            list(iter_files(self.root)), sorted(os.path.normpath(p) for p in paths)
+        )
+
+    def test_ignores_default_patterns(self):
+        self.touch(
+            "index.md",
+            ".git/config",
+            "_drafts/post.md",
+            "blog/.post.md.swp",
+            "blog/post.md~",
+            "blog/.#post.md",
+            "blog/post.md",
+        )
+        self.assertEqual(list(iter_files(self.root)), ["blog/post.md", "index.md"])
+
+    def test_custom_ignore_patterns(self):
+        self.touch("index.md", "private/secret.md", "notes.txt")
+        self.assertEqual(
+            list(iter_files(self.root, ("private", "*.txt"))), ["index.md"]
+        )
+        self.assertEqual(len(list(iter_files(self.root, ()))), 3)
+
+    def test_is_lazy(self):
+        self.touch("a.md", "b/c.md")
+        files = iter_files(self.root)
+        self.assertEqual(next(files), "a.md")
+        os.remove(os.path.join(self.root, "b", "c.md"))
+        os.rmdir(os.path.join(self.root, "b"))
+        self.assertEqual(list(files), [])
+
+    def test_missing_root(self):
+        self.assertEqual(list(iter_files(os.path.join(self.root, "missing"))), [])
+
+    def test_ignore_matcher(self):
+        ignored = ignore_matcher(DEFAULT_IGNORE)
+        self.assertTrue(ignored(".git"))
+        self.assertTrue(ignored("index.md.swp"))
+        self.assertFalse(ignored("index.md"))
+        self.assertFalse(ignore_matcher(())("anything"))
+
+
+class TestGeneratePagesIgnore(unittest.TestCase):
+    def test_drafts_are_not_rendered(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            template = os.path.join(tmp, "template.html")
+            content = os.path.join(tmp, "content")
+            output = os.path.join(tmp, "public")
+            os.makedirs(os.path.join(content, "_drafts"))
+            with open(template, "w") as file:
+                file.write("{{ Content }}")
+            for page in ("index.md", "_drafts/draft.md"):
+                with open(os.path.join(content, page), "w") as file:
+                    file.write("# Title")
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages(content, output, template, "/")
+            self.assertTrue(os.path.exists(os.path.join(output, "index.html")))
+            self.assertFalse(os.path.exists(os.path.join(output, "_drafts")))
+
+
+if __name__ == "__main__":
+    unittest.main()